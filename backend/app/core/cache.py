@@ -0,0 +1,113 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.core import database
+from app.core.config import settings
+from app.core.database import Base
+
+logger = logging.getLogger(__name__)
+
+
+class CacheVersion(Base):
+    __tablename__ = "cache_versions"
+
+    name = Column(String, primary_key=True)  # e.g. "master_lead_status", "settings"
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+def bump_version(db: Session, name: str) -> None:
+    # Runs inside the caller's transaction, so other workers only see the new
+    # version once the write that caused it has been committed. A single
+    # upsert, so two first bumps of the same name cannot both try to insert.
+    dialect = db.get_bind(mapper=CacheVersion).dialect.name
+    insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+    stmt = insert(CacheVersion).values(name=name, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CacheVersion.name],
+        set_={"version": CacheVersion.version + 1, "updated_at": func.now()},
+    )
+    db.execute(stmt)
+
+
+class VersionTracker:
+    """
+    Process-wide view of cache_versions.
+
+    get() only reads memory, so request handlers never wait on the database.
+    A background thread re-reads the table once per poll interval (or right
+    away after expire()) and then runs the registered listeners, which reload
+    whichever caches went stale; until a reload finishes the previous
+    snapshot keeps being served.
+    """
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self._versions: Dict[str, int] = {}
+        self._listeners: List[Callable[[], None]] = []
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get(self, name: str) -> int:
+        return self._versions.get(name, 0)
+
+    def on_refresh(self, listener: Callable[[], None]) -> None:
+        self._listeners.append(listener)
+
+    def refresh(self) -> None:
+        # Blocking; call it from the refresher thread, a worker thread or startup
+        db = database.SessionLocal()
+        try:
+            rows = db.query(CacheVersion.name, CacheVersion.version).all()
+            self._versions = {name: version for name, version in rows}
+        except Exception as e:
+            # Keep serving the last known versions if the poll fails
+            logger.warning("Could not poll cache versions (%s)", e)
+        finally:
+            db.close()
+
+    def expire(self) -> None:
+        # Ask the refresher thread to poll now instead of at the next interval
+        self._wake.set()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if self._stopping.is_set():
+                break
+            self.refresh()
+            for listener in self._listeners:
+                try:
+                    listener()
+                except Exception:
+                    logger.exception("Cache refresh failed")
+
+
+version_tracker = VersionTracker(settings.CACHE_POLL_INTERVAL_SECONDS)
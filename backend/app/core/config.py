@@ -19,6 +19,58 @@ class Settings:
     POSTGRES_PORT: str = os.getenv("POSTGRES_PORT", "5432")
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "swcrm")
     DATABASE_URL: str = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    ASYNC_DATABASE_URL: str = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+
+    # Optional read replica (postgresql:// URL); list endpoints read from it when set
+    DATABASE_REPLICA_URL: str = os.getenv("DATABASE_REPLICA_URL", "")
+
+    # Connection pool, applied per engine and per worker process
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+    # Caching
+    CACHE_POLL_INTERVAL_SECONDS: float = float(os.getenv("CACHE_POLL_INTERVAL_SECONDS", "5"))
+    MASTER_DATA_CACHE_TTL_SECONDS: float = float(os.getenv("MASTER_DATA_CACHE_TTL_SECONDS", "300"))
+
+    # Activity log: "transactional" (written with the caller's commit) or
+    # "async" (buffered and batch-inserted by a background writer)
+    ACTIVITY_LOG_MODE: str = os.getenv("ACTIVITY_LOG_MODE", "transactional")
+    ACTIVITY_QUEUE_SIZE: int = int(os.getenv("ACTIVITY_QUEUE_SIZE", "10000"))
+    ACTIVITY_BATCH_SIZE: int = int(os.getenv("ACTIVITY_BATCH_SIZE", "500"))
+    ACTIVITY_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("ACTIVITY_FLUSH_INTERVAL_SECONDS", "1"))
+    ACTIVITY_ENQUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ACTIVITY_ENQUEUE_TIMEOUT_SECONDS", "5"))
+
+    # Bulk lead import: rows validated and inserted per transaction
+    LEAD_IMPORT_CHUNK_SIZE: int = int(os.getenv("LEAD_IMPORT_CHUNK_SIZE", "5000"))
+
+    # Resolved JWT principals, cached per worker
+    AUTH_USER_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "60"))
+    AUTH_USER_CACHE_SIZE: int = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+
+    # Password hashing runs in a process pool, off the event loop
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_CONCURRENCY: int = int(os.getenv("PASSWORD_HASH_CONCURRENCY", os.getenv("PASSWORD_HASH_WORKERS", "2")))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "100"))
+
+    # Global search latency budget (Postgres statement_timeout)
+    SEARCH_TIMEOUT_MS: int = int(os.getenv("SEARCH_TIMEOUT_MS", "300"))
+
+    # Attachment uploads: streamed to disk in chunks and stored by SHA-256
+    UPLOAD_MAX_BYTES: int = int(os.getenv("UPLOAD_MAX_BYTES", str(25 * 1024 * 1024)))
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+    # Request metrics (/metrics) and the Server-Timing response header
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() in ("1", "true", "yes")
+
+    # Dev/staging only: log N+1 query patterns and slow statements per request
+    QUERY_INSPECTOR_ENABLED: bool = os.getenv("QUERY_INSPECTOR_ENABLED", "false").lower() in ("1", "true", "yes")
+    QUERY_INSPECTOR_SLOW_MS: float = float(os.getenv("QUERY_INSPECTOR_SLOW_MS", "200"))
+    QUERY_INSPECTOR_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_INSPECTOR_REPEAT_THRESHOLD", "5"))
 
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = [
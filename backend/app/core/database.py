@@ -1,9 +1,99 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import functools
+import inspect
+import time
+from sqlalchemy import Select, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core import metrics
+from app.core.query_inspector import query_inspector
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+USE_REPLICA = "use_replica"
+
+class _TimedCheckout:
+    # Time spent waiting for (or opening) a pooled connection, per request
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            metrics.record_pool_wait(time.perf_counter() - started)
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+def _engine_options():
+    return dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+def _async_url(url: str):
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+engine = create_engine(settings.DATABASE_URL, poolclass=TimedQueuePool, **_engine_options())
+replica_engine = (
+    create_engine(settings.DATABASE_REPLICA_URL, poolclass=TimedQueuePool, **_engine_options())
+    if settings.DATABASE_REPLICA_URL else None
+)
+
+# Async path for read endpoints that run on the event loop
+async_engine = create_async_engine(settings.ASYNC_DATABASE_URL, poolclass=TimedAsyncQueuePool, **_engine_options())
+async_replica_engine = (
+    create_async_engine(_async_url(settings.DATABASE_REPLICA_URL), poolclass=TimedAsyncQueuePool, **_engine_options())
+    if settings.DATABASE_REPLICA_URL else None
+)
+
+for _engine in (engine, replica_engine, async_engine, async_replica_engine):
+    if _engine is not None:
+        metrics.instrument_engine(getattr(_engine, "sync_engine", _engine))
+        if settings.QUERY_INSPECTOR_ENABLED:
+            query_inspector.instrument_engine(getattr(_engine, "sync_engine", _engine))
+
+
+class RoutingSession(Session):
+    """
+    Sends SELECTs to the read replica while a `replica_read` service method
+    is running; flushes, writes and everything else go to the primary.
+    """
+
+    def _replica(self):
+        return replica_engine
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self._replica()
+        if (
+            replica is not None
+            and self.info.get(USE_REPLICA)
+            and not self._flushing
+            and isinstance(clause, Select)
+        ):
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+class AsyncRoutingSession(RoutingSession):
+    # AsyncSession drives a sync Session underneath, which needs sync engines
+    def _replica(self):
+        return async_replica_engine.sync_engine if async_replica_engine is not None else None
+
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RoutingSession)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=AsyncRoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 Base = declarative_base()
 
@@ -13,3 +103,45 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def replica_read(fn):
+    """
+    Mark a read-only service method (first argument is the session) so its
+    queries are served by the read replica, if one is configured.
+    """
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(db, *args, **kwargs):
+            previous = db.info.get(USE_REPLICA)
+            db.info[USE_REPLICA] = True
+            try:
+                return await fn(db, *args, **kwargs)
+            finally:
+                db.info[USE_REPLICA] = previous
+        return async_wrapper
+
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def generator_wrapper(db, *args, **kwargs):
+            previous = db.info.get(USE_REPLICA)
+            db.info[USE_REPLICA] = True
+            try:
+                yield from fn(db, *args, **kwargs)
+            finally:
+                db.info[USE_REPLICA] = previous
+        return generator_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(db, *args, **kwargs):
+        previous = db.info.get(USE_REPLICA)
+        db.info[USE_REPLICA] = True
+        try:
+            return fn(db, *args, **kwargs)
+        finally:
+            db.info[USE_REPLICA] = previous
+    return wrapper
@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime
+from typing import Callable, Iterable, Iterator, List
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core import database
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_BATCH_SIZE = 1000
+FLUSH_BYTES = 64 * 1024
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _encode(rows: Iterable[dict], fields: List[str], fmt: str) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(fields)
+        # Send the header straight away so the client sees the first byte
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    for row in rows:
+        if fmt == "csv":
+            writer.writerow([_csv_value(row.get(field)) for field in fields])
+        else:
+            buffer.write(json.dumps({field: row.get(field) for field in fields}, default=_json_default))
+            buffer.write("\n")
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(
+    rows: Callable[[Session], Iterable[dict]],
+    fields: List[str],
+    fmt: str,
+    filename: str,
+) -> StreamingResponse:
+    """
+    Stream `rows(db)` as CSV or NDJSON. The generator owns its session, since
+    it keeps running after the route function has returned.
+    """
+    def generate():
+        db = database.SessionLocal()
+        try:
+            yield from _encode(rows(db), fields, fmt)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -0,0 +1,46 @@
+import hashlib
+from email.utils import parsedate_to_datetime
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    # Strong validator over whatever identifies the representation
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def modified_since(request: Request, mtime: float) -> bool:
+    # Only consulted when the client sent no If-None-Match
+    if request.headers.get("if-none-match"):
+        return True
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return True
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return True
+    return int(mtime) > since
+
+
+# Clients may keep a copy but must revalidate it; a matching ETag costs a 304
+REVALIDATE = "private, no-cache"
+
+
+def set_validators(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": REVALIDATE})
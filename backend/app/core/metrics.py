@@ -0,0 +1,223 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    """Database cost of the request being served, filled in by the engine hooks."""
+
+    __slots__ = ("sql_count", "sql_seconds", "sql_rows", "pool_wait_seconds")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.sql_rows = 0
+        self.pool_wait_seconds = 0.0
+
+    def server_timing(self, elapsed: float) -> str:
+        return (
+            f"app;dur={elapsed * 1000:.1f}, "
+            f'db;dur={self.sql_seconds * 1000:.1f};desc="{self.sql_count} queries", '
+            f"pool;dur={self.pool_wait_seconds * 1000:.1f}"
+        )
+
+
+# Copied into threadpool workers and SQLAlchemy's async greenlets, so sync
+# routes and AsyncSession queries both report into the same object
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def record_pool_wait(seconds: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_seconds += time.perf_counter() - started
+        stats.sql_rows += max(cursor.rowcount or 0, 0)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute doesn't fire for a failed statement
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class _RouteMetrics:
+    __slots__ = ("requests", "errors", "seconds", "buckets", "sql_count", "sql_seconds", "sql_rows", "pool_wait_seconds")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.sql_rows = 0
+        self.pool_wait_seconds = 0.0
+
+
+class MetricsRegistry:
+    """
+    Per-worker request metrics keyed by (method, route template).
+
+    Each worker process keeps its own counters; scrape every worker (or sum
+    across them) when running more than one.
+    """
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str], _RouteMetrics] = {}
+        self._collectors: List[Tuple[str, Callable[[], Dict[str, float]]]] = []
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = _RouteMetrics()
+            metrics.requests += 1
+            if status >= 500:
+                metrics.errors += 1
+            metrics.seconds += seconds
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    metrics.buckets[i] += 1
+            metrics.sql_count += stats.sql_count
+            metrics.sql_seconds += stats.sql_seconds
+            metrics.sql_rows += stats.sql_rows
+            metrics.pool_wait_seconds += stats.pool_wait_seconds
+
+    def register_collector(self, prefix: str, collect: Callable[[], Dict[str, float]]) -> None:
+        # `collect` returns current gauge values, e.g. password_hasher.stats
+        self._collectors.append((prefix, collect))
+
+    def render(self) -> str:
+        with self._lock:
+            routes = [(key, _snapshot(metrics)) for key, metrics in sorted(self._routes.items())]
+
+        lines: List[str] = []
+        lines += _header("http_request_duration_seconds", "histogram", "Request wall time by route")
+        for (method, route), m in routes:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            for bound, count in zip(DURATION_BUCKETS, m.buckets):
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {m.requests}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {m.seconds:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {m.requests}")
+
+        counters = (
+            ("http_request_errors_total", "Responses with a 5xx status", "errors", "{}"),
+            ("http_request_sql_statements_total", "SQL statements executed", "sql_count", "{}"),
+            ("http_request_sql_seconds_total", "Time spent executing SQL", "sql_seconds", "{:.6f}"),
+            ("http_request_sql_rows_total", "Rows returned or affected by SQL", "sql_rows", "{}"),
+            ("http_request_pool_wait_seconds_total", "Time spent checking out pooled connections", "pool_wait_seconds", "{:.6f}"),
+        )
+        for name, help_text, attr, fmt in counters:
+            lines += _header(name, "counter", help_text)
+            for (method, route), m in routes:
+                value = fmt.format(getattr(m, attr))
+                lines.append(f'{name}{{method="{method}",route="{_escape(route)}"}} {value}')
+
+        for prefix, collect in self._collectors:
+            try:
+                values = collect()
+            except Exception:
+                continue
+            for key, value in values.items():
+                lines += _header(f"{prefix}_{key}", "gauge", None)
+                lines.append(f"{prefix}_{key} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _snapshot(metrics: _RouteMetrics) -> _RouteMetrics:
+    copy = _RouteMetrics()
+    for attr in _RouteMetrics.__slots__:
+        value = getattr(metrics, attr)
+        setattr(copy, attr, list(value) if isinstance(value, list) else value)
+    return copy
+
+
+def _header(name: str, kind: str, help_text: Optional[str]) -> List[str]:
+    lines = [f"# HELP {name} {help_text}"] if help_text else []
+    lines.append(f"# TYPE {name} {kind}")
+    return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def route_template(scope: Scope) -> str:
+    # Set by the router once a route matched, e.g. "/leads/{lead_id}"
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return scope.get("root_path", "") + path if path else UNMATCHED_ROUTE
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    Times each HTTP request, collects its SQL cost and records both under the
+    matched route template. Adds a Server-Timing header when enabled.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", stats.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            registry.observe(scope["method"], route_template(scope), status, time.perf_counter() - started, stats)
@@ -0,0 +1,194 @@
+import logging
+import os
+import re
+import sys
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+try:
+    import greenlet
+except ImportError:  # pragma: no cover - SQLAlchemy's asyncio extra installs it
+    greenlet = None
+
+logger = logging.getLogger(__name__)
+
+MODULES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "modules") + os.sep
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = r"(?:%\(\w+\)s|\$\d+|\?|(?<!:):\w+)"
+_PARAM_LIST = re.compile(r"\(\s*" + _PLACEHOLDER + r"(?:\s*,\s*" + _PLACEHOLDER + r")+\s*\)")
+_PARAM = re.compile(_PLACEHOLDER)
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+def fingerprint(statement: str) -> str:
+    # Same shape, different values: IN-lists of any length and every bound
+    # parameter collapse to a single placeholder
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _PARAM_LIST.sub("(?)", normalized)
+    return _PARAM.sub("?", normalized)
+
+
+def _origin_in(frame) -> Optional[str]:
+    router = None
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.startswith(MODULES_DIR):
+            name = f"{os.path.basename(os.path.dirname(code.co_filename))}.{getattr(code, 'co_qualname', code.co_name)}"
+            if not code.co_filename.endswith("router.py"):
+                return name
+            router = router or name
+        frame = frame.f_back
+    return router
+
+
+def origin() -> str:
+    """The innermost service-layer function (or route handler) that issued the query."""
+    found = _origin_in(sys._getframe(1))
+    if found is None and greenlet is not None:
+        # AsyncSession runs the sync ORM in a child greenlet; the awaiting
+        # coroutine is suspended in the parent
+        parent = greenlet.getcurrent().parent
+        if parent is not None and parent.gr_frame is not None:
+            found = _origin_in(parent.gr_frame)
+    return found or "<outside app code, e.g. a lazy load while serializing>"
+
+
+class _Seen:
+    __slots__ = ("count", "origin", "plan")
+
+    def __init__(self, origin: str):
+        self.count = 0
+        self.origin = origin
+        self.plan: Optional[str] = None
+
+
+class QueryLog:
+    def __init__(self, scope: Scope, repeat_threshold: int):
+        self.scope = scope
+        self.repeat_threshold = repeat_threshold
+        self.seen: Dict[str, _Seen] = {}
+
+    @property
+    def label(self) -> str:
+        return f"{self.scope['method']} {route_template(self.scope)}"
+
+    def report(self) -> None:
+        for shape, seen in self.seen.items():
+            if seen.count >= self.repeat_threshold:
+                logger.warning(
+                    "Possible N+1 on %s: %d identical-shape queries from %s\n  %s%s",
+                    self.label, seen.count, seen.origin, shape[:500], _format_plan(seen.plan),
+                )
+
+
+_current: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+
+
+def _format_plan(plan: Optional[str]) -> str:
+    return "\n  plan:\n    " + plan.replace("\n", "\n    ") if plan else ""
+
+
+def _explain(conn, statement, parameters, executemany) -> Optional[str]:
+    if executemany or conn.dialect.name != "postgresql" or not _EXPLAINABLE.match(statement):
+        return None
+    # Plain EXPLAIN doesn't execute the statement. The savepoint keeps a
+    # failed EXPLAIN from aborting the caller's transaction.
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT query_inspector")
+        try:
+            cursor.execute("EXPLAIN " + statement, parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT query_inspector")
+            return None
+        cursor.execute("RELEASE SAVEPOINT query_inspector")
+        return plan
+    except Exception:
+        return None
+    finally:
+        cursor.close()
+
+
+class QueryInspector:
+    """
+    Development aid: flags statements slower than `slow_seconds` as they run,
+    and at the end of each request every statement shape repeated at least
+    `repeat_threshold` times, each with the service method that issued it and
+    a sample EXPLAIN plan.
+    """
+
+    def __init__(self, slow_seconds: float, repeat_threshold: int):
+        self.slow_seconds = slow_seconds
+        self.repeat_threshold = repeat_threshold
+
+    def instrument_engine(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("inspector_started", []).append(time.perf_counter())
+
+    def _handle_error(self, exception_context):
+        started = exception_context.connection.info.get("inspector_started") if exception_context.connection else None
+        if started:
+            started.pop()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["inspector_started"].pop()
+        log = _current.get()
+        shape = fingerprint(statement)
+        where = None
+
+        if log is not None:
+            seen = log.seen.get(shape)
+            if seen is None:
+                where = origin()
+                seen = log.seen[shape] = _Seen(where)
+            seen.count += 1
+            if seen.count == self.repeat_threshold:
+                seen.plan = _explain(conn, statement, parameters, executemany)
+
+        if elapsed >= self.slow_seconds:
+            logger.warning(
+                "Slow query (%.0f ms) on %s from %s\n  %s%s",
+                elapsed * 1000,
+                log.label if log is not None else "<no request>",
+                where or origin(),
+                _WHITESPACE.sub(" ", statement)[:500],
+                _format_plan(_explain(conn, statement, parameters, executemany)),
+            )
+
+
+query_inspector = QueryInspector(
+    slow_seconds=settings.QUERY_INSPECTOR_SLOW_MS / 1000,
+    repeat_threshold=settings.QUERY_INSPECTOR_REPEAT_THRESHOLD,
+)
+
+
+class QueryInspectorMiddleware:
+    def __init__(self, app: ASGIApp, inspector: QueryInspector):
+        self.app = app
+        self.inspector = inspector
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        log = QueryLog(scope, self.inspector.repeat_threshold)
+        token = _current.set(log)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            log.report()
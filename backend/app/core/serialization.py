@@ -0,0 +1,20 @@
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def fast_json_response(adapter: TypeAdapter, content: Any, status_code: int = 200) -> Response:
+    """
+    Validate plain dicts (columns-only rows) against `adapter` in one pass and
+    encode them straight to JSON bytes in pydantic-core.
+
+    Returning a Response skips FastAPI's response_model validation and the
+    jsonable_encoder + json.dumps round trip; keep response_model on the route
+    for the OpenAPI schema.
+    """
+    return Response(
+        adapter.dump_json(adapter.validate_python(content)),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -0,0 +1,176 @@
+import hashlib
+import os
+import uuid
+from typing import Dict, Optional
+
+from fastapi import Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+MAX_FIELD_BYTES = 64 * 1024
+
+
+class UploadError(ValueError):
+    pass
+
+
+class UploadTooLarge(UploadError):
+    pass
+
+
+class ReceivedFile:
+    """A file part spooled to `temp_path`, hashed while it was being written."""
+
+    def __init__(self, filename: str, content_type: Optional[str], temp_path: str):
+        self.filename = filename
+        self.content_type = content_type
+        self.temp_path = temp_path
+        self.size = 0
+        self._hash = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def discard(self) -> None:
+        try:
+            os.remove(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+
+class _Part:
+    def __init__(self):
+        self.headers: Dict[bytes, bytes] = {}
+        self.name: Optional[str] = None
+        self.data = bytearray()
+        self.file: Optional[ReceivedFile] = None
+
+
+class StreamingUpload:
+    """
+    Reads a multipart body straight off the ASGI stream.
+
+    Form fields are kept in memory (up to MAX_FIELD_BYTES each); the single file
+    part is buffered up to `chunk_size` and then written to `temp_dir` from the
+    threadpool, so the event loop never blocks on disk and at most one chunk is
+    held in memory. The body is rejected as soon as the file exceeds `max_bytes`.
+    """
+
+    def __init__(self, temp_dir: str, max_bytes: int, chunk_size: int):
+        self.temp_dir = temp_dir
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.fields: Dict[str, str] = {}
+        self.file: Optional[ReceivedFile] = None
+        self._part = _Part()
+        self._header_name = b""
+        self._header_value = b""
+        self._pending = bytearray()
+        self._handle = None
+
+    async def receive(self, request: Request) -> "StreamingUpload":
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise UploadError("Expected a multipart/form-data body")
+        declared = request.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > self.max_bytes + MAX_FIELD_BYTES:
+            raise UploadTooLarge(f"File exceeds {self.max_bytes} bytes")
+
+        parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                if len(self._pending) >= self.chunk_size:
+                    await self._flush()
+            parser.finalize()
+            await self._flush()
+        except BaseException:
+            await run_in_threadpool(self._close)
+            if self.file is not None:
+                self.file.discard()
+            raise
+        await run_in_threadpool(self._close)
+        if self.file is None:
+            raise UploadError("No file part in upload")
+        return self
+
+    # Parser callbacks run synchronously inside parser.write()
+
+    def _on_part_begin(self) -> None:
+        self._part = _Part()
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._part.headers[self._header_name.lower()] = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._part.headers.get(b"content-disposition", b""))
+        if b"name" not in options:
+            raise UploadError("Multipart part without a name")
+        self._part.name = options[b"name"].decode("utf-8", "replace")
+        if b"filename" in options:
+            if self.file is not None:
+                raise UploadError("Only one file may be uploaded at a time")
+            content_type = self._part.headers.get(b"content-type")
+            self.file = ReceivedFile(
+                filename=os.path.basename(options[b"filename"].decode("utf-8", "replace")) or "upload",
+                content_type=content_type.decode("latin-1") if content_type else None,
+                temp_path=os.path.join(self.temp_dir, f"{uuid.uuid4().hex}.part"),
+            )
+            self._part.file = self.file
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        chunk = data[start:end]
+        file = self._part.file
+        if file is None:
+            if len(self._part.data) + len(chunk) > MAX_FIELD_BYTES:
+                raise UploadError("Form field too large")
+            self._part.data.extend(chunk)
+            return
+        file.size += len(chunk)
+        if file.size > self.max_bytes:
+            raise UploadTooLarge(f"File exceeds {self.max_bytes} bytes")
+        file._hash.update(chunk)
+        self._pending.extend(chunk)
+
+    def _on_part_end(self) -> None:
+        if self._part.file is None and self._part.name is not None:
+            self.fields[self._part.name] = self._part.data.decode("utf-8", "replace")
+
+    async def _flush(self) -> None:
+        if not self._pending:
+            return
+        data = bytes(self._pending)
+        self._pending.clear()
+        await run_in_threadpool(self._write, data)
+
+    def _write(self, data: bytes) -> None:
+        if self._handle is None:
+            os.makedirs(self.temp_dir, exist_ok=True)
+            self._handle = open(self.file.temp_path, "wb")
+        self._handle.write(data)
+
+    def _close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        elif self.file is not None and not os.path.exists(self.file.temp_path):
+            # Empty file: nothing was ever flushed
+            os.makedirs(self.temp_dir, exist_ok=True)
+            open(self.file.temp_path, "wb").close()
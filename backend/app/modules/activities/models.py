@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Integer, UUID
+from sqlalchemy import Column, String, DateTime, Integer, UUID, Index, cast
 from sqlalchemy.sql import func
 import uuid
 from app.core.database import Base
@@ -10,9 +10,23 @@ class Activity(Base):
     
     action_type = Column(String, nullable=False) # e.g., "CREATE", "UPDATE", "DELETE", "CONVERT"
     entity_type = Column(String, nullable=False) # e.g., "LEAD", "DEAL"
-    entity_id = Column(String, nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
     description = Column(String, nullable=True)
     
     user_id = Column(Integer, nullable=True) # Linked to User.id (if available)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+# Activity feed of one record, newest first
+Index("ix_activities_entity_created_at", Activity.entity_type, Activity.entity_id, Activity.created_at.desc())
+
+# Databases created before entity_id became a uuid keep a varchar column until
+# scripts/migrate_003_entity_indexes.py converts it. init_db sets this flag when
+# it finds one, so lookups compare as text meanwhile (asyncpg binds a typed
+# uuid, and Postgres has no varchar = uuid operator)
+LEGACY_TEXT_ENTITY_ID = False
+
+def entity_id_matches(entity_id):
+    if LEGACY_TEXT_ENTITY_ID:
+        return cast(Activity.entity_id, String) == str(entity_id)
+    return Activity.entity_id == entity_id
@@ -1,10 +1,11 @@
+import uuid
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from .services import ActivityService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from .services import AsyncActivityService
 
 router = APIRouter()
 
 @router.get("/{entity_type}/{entity_id}")
-def read_activities(entity_type: str, entity_id: str, db: Session = Depends(get_db)):
-    return ActivityService.get_activities(db, entity_type.upper(), entity_id)
+async def read_activities(entity_type: str, entity_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    return await AsyncActivityService.get_activities(db, entity_type.upper(), entity_id)
@@ -1,5 +1,12 @@
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from .models import Activity
+from app.core.config import settings
+from app.core.database import replica_read
+from .models import Activity, entity_id_matches
+from .sink import PENDING_KEY
 
 class ActivityService:
     @staticmethod
@@ -7,24 +14,48 @@ class ActivityService:
         db: Session,
         action_type: str,
         entity_type: str,
-        entity_id: str,
+        entity_id: uuid.UUID,
         description: str,
         user_id: int = None
     ):
-        activity = Activity(
+        """
+        Record an activity as part of the caller's transaction; it is written
+        when the caller commits. With ACTIVITY_LOG_MODE=async the row is handed
+        to the background writer after the commit instead.
+        """
+        values = dict(
             action_type=action_type,
             entity_type=entity_type,
-            entity_id=str(entity_id),
+            entity_id=entity_id if isinstance(entity_id, uuid.UUID) else uuid.UUID(str(entity_id)),
             description=description,
-            user_id=user_id
+            user_id=user_id,
+            created_at=datetime.now(timezone.utc),
         )
+        if settings.ACTIVITY_LOG_MODE == "async":
+            db.info.setdefault(PENDING_KEY, []).append(values)
+            return Activity(**values)
+
+        activity = Activity(**values)
         db.add(activity)
-        db.commit()
-        db.refresh(activity)
         return activity
+
     @staticmethod
-    def get_activities(db: Session, entity_type: str, entity_id: str):
+    @replica_read
+    def get_activities(db: Session, entity_type: str, entity_id: uuid.UUID):
         return db.query(Activity).filter(
             Activity.entity_type == entity_type,
-            Activity.entity_id == entity_id
+            entity_id_matches(entity_id)
         ).order_by(Activity.created_at.desc()).all()
+
+
+class AsyncActivityService:
+    @staticmethod
+    @replica_read
+    async def get_activities(db: AsyncSession, entity_type: str, entity_id: uuid.UUID):
+        result = await db.execute(
+            select(Activity).filter(
+                Activity.entity_type == entity_type,
+                entity_id_matches(entity_id)
+            ).order_by(Activity.created_at.desc())
+        )
+        return result.scalars().all()
@@ -0,0 +1,115 @@
+import logging
+import queue
+import threading
+from typing import List, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from app.core import database
+from app.core.config import settings
+from .models import Activity
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "pending_activities"
+
+
+class ActivityBuffer:
+    """
+    Bounded queue of activity rows written by a background thread with
+    multi-row INSERTs.
+
+    Producers block for up to `enqueue_timeout` seconds when the queue is
+    full (backpressure); if it is still full the row is written inline so
+    nothing is dropped.
+    """
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float, enqueue_timeout: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_size)
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="activity-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        # Flush-on-shutdown: drain whatever is still queued before returning
+        if not self.running:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, rows: List[dict]) -> None:
+        for row in rows:
+            if not self.running:
+                self._write([row])
+                continue
+            try:
+                self._queue.put(row, timeout=self.enqueue_timeout)
+            except queue.Full:
+                logger.warning("Activity queue full, writing activity inline")
+                self._write([row])
+
+    def _run(self) -> None:
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = self._take_batch()
+            if batch:
+                self._write(batch)
+
+    def _take_batch(self) -> List[dict]:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, rows: List[dict]) -> None:
+        db = database.SessionLocal()
+        try:
+            db.execute(insert(Activity), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Failed to write %d activities", len(rows))
+        finally:
+            db.close()
+
+
+activity_buffer = ActivityBuffer(
+    max_size=settings.ACTIVITY_QUEUE_SIZE,
+    batch_size=settings.ACTIVITY_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_FLUSH_INTERVAL_SECONDS,
+    enqueue_timeout=settings.ACTIVITY_ENQUEUE_TIMEOUT_SECONDS,
+)
+
+
+# In async mode activities are parked on the session and only handed to the
+# buffer once the business transaction commits; a rollback discards them.
+@event.listens_for(Session, "after_commit")
+def _enqueue_pending_activities(session: Session):
+    rows = session.info.pop(PENDING_KEY, None)
+    if rows:
+        activity_buffer.submit(rows)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_activities(session: Session):
+    session.info.pop(PENDING_KEY, None)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, UUID, Boolean, Text
+from sqlalchemy import Column, String, DateTime, UUID, Boolean, Text, Index, Integer, BigInteger
 from sqlalchemy.sql import func
 import uuid
 from app.core.database import Base
@@ -17,5 +17,21 @@ class Attachment(Base):
     entity_id = Column(UUID(as_uuid=True), nullable=False)
     
     uploaded_by = Column(String, nullable=True) # User ID or Name
+    sha256 = Column(String(64), nullable=True) # NULL for files uploaded before blobs existed
+    file_size = Column(BigInteger, nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+# Files attached to one record
+Index("ix_attachments_entity_created_at", Attachment.entity_type, Attachment.entity_id, Attachment.created_at.desc())
+
+class AttachmentBlob(Base):
+    __tablename__ = "attachment_blobs"
+
+    # Content-addressed file shared by every attachment with the same bytes
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,8 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse
+from python_multipart.exceptions import MultipartParseError
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.config import settings
+from app.core.database import get_db, get_async_db
+from app.core.http_cache import REVALIDATE, etag_matches, make_etag, modified_since, not_modified
+from app.core.uploads import StreamingUpload, UploadError, UploadTooLarge
+from app.modules.auth.dependencies import get_optional_user
+from app.modules.auth.schemas import UserPrincipal
 from . import schemas, services
+import os
 import uuid
 
 router = APIRouter()
@@ -27,26 +36,99 @@ def fix_schema(db: Session = Depends(get_db)):
         import traceback
         return {"error": str(e), "trace": traceback.format_exc()}
 
+def _form_bool(value: str | None) -> bool:
+    return (value or "").strip().lower() in ("1", "true", "on", "yes")
+
 @router.post("/upload", response_model=schemas.AttachmentResponse)
-def upload_attachment(
-    entity_type: str = Form(...),
-    entity_id: uuid.UUID = Form(...),
-    is_public: bool = Form(False),
-    description: str | None = Form(None),
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db)
-):
-    # In a real app, get user from token
-    uploaded_by = "System" 
+async def upload_attachment(request: Request, db: AsyncSession = Depends(get_async_db)):
+    # Fields: entity_type, entity_id, is_public, description and one `file` part.
+    # The body is parsed off the stream rather than through UploadFile so the
+    # size limit applies while the client is still sending.
+    receiver = StreamingUpload(
+        services.TEMP_DIR, settings.UPLOAD_MAX_BYTES, settings.UPLOAD_CHUNK_SIZE
+    )
+    try:
+        upload = await receiver.receive(request)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (UploadError, MultipartParseError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    file = upload.file
     try:
-        return services.AttachmentService.upload_file(
-            db, file, entity_type, entity_id, is_public, uploaded_by, description=description
+        entity_type = upload.fields.get("entity_type")
+        if not entity_type:
+            raise HTTPException(status_code=422, detail="entity_type is required")
+        try:
+            entity_id = uuid.UUID(upload.fields.get("entity_id", ""))
+        except ValueError:
+            raise HTTPException(status_code=422, detail="entity_id must be a UUID")
+
+        # In a real app, get user from token
+        uploaded_by = "System" 
+        attachment = await db.run_sync(
+            services.AttachmentService.register_upload,
+            file,
+            entity_type,
+            entity_id,
+            _form_bool(upload.fields.get("is_public")),
+            uploaded_by,
+            upload.fields.get("description") or None,
         )
-    except Exception as e:
-        print(f"Error uploading file: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+        return attachment
+    finally:
+        file.discard()
+
+@router.get("/{id}/download")
+def download_attachment(
+    id: uuid.UUID,
+    request: Request,
+    inline: bool = False,
+    db: Session = Depends(get_db),
+    user: Optional[UserPrincipal] = Depends(get_optional_user),
+):
+    attachment = services.AttachmentService.get_attachment(db, id)
+    if not attachment:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    # Private files are readable by any active signed-in user, like the
+    # records they hang off; there is no per-entity ownership check
+    if not attachment.is_public:
+        if user is None:
+            raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+        if not user.is_active:
+            raise HTTPException(status_code=403, detail="Inactive user")
+
+    try:
+        stat_result = os.stat(attachment.file_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    # Blob content never changes, so its hash is a strong validator (and
+    # FileResponse checks If-Range against it before serving a partial range)
+    if attachment.sha256:
+        etag = f'"{attachment.sha256}"'
+    else:
+        etag = make_etag(attachment.id, stat_result.st_mtime, stat_result.st_size)
+    if etag_matches(request, etag) or not modified_since(request, stat_result.st_mtime):
+        return not_modified(etag)
+
+    media_type = (attachment.file_type or "").split(";")[0].strip().lower()
+    if media_type not in services.INLINE_MEDIA_TYPES:
+        media_type, inline = "application/octet-stream", False
+
+    return FileResponse(
+        attachment.file_path,
+        stat_result=stat_result,
+        media_type=media_type,
+        filename=attachment.file_name,
+        content_disposition_type="inline" if inline else "attachment",
+        headers={
+            "ETag": etag,
+            "Cache-Control": REVALIDATE,
+            "X-Content-Type-Options": "nosniff",
+            "Content-Security-Policy": "sandbox",
+        },
+    )
 
 @router.get("/{entity_type}/{entity_id}", response_model=List[schemas.AttachmentResponse])
 def get_attachments(
@@ -15,10 +15,12 @@ class AttachmentCreate(AttachmentBase):
     uploaded_by: Optional[str] = None
 
 class AttachmentResponse(AttachmentBase):
+    # No file_path: files are only reachable through /attachments/{id}/download
     id: UUID4
-    file_path: str
     created_at: datetime
     uploaded_by: Optional[str] = None
+    sha256: Optional[str] = None
+    file_size: Optional[int] = None
 
     class Config:
         from_attributes = True
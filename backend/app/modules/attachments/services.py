@@ -1,42 +1,99 @@
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from .models import Attachment
+from app.core.uploads import ReceivedFile
+from .models import Attachment, AttachmentBlob
 import uuid
 import os
-import shutil
-from fastapi import UploadFile
 
 UPLOAD_DIR = "uploads"
+BLOB_DIR = f"{UPLOAD_DIR}/blobs"
+# Partial uploads stay outside UPLOAD_DIR but on the same filesystem, so
+# moving a finished file into BLOB_DIR is a rename
+TEMP_DIR = "upload_tmp"
+# File types the browser may render inline from our origin. The stored type is
+# whatever the client sent at upload, so everything else (HTML, SVG, scripts,
+# ...) is only ever served as an opaque download
+INLINE_MEDIA_TYPES = {
+    "image/png", "image/jpeg", "image/gif", "image/webp", "image/avif", "image/bmp",
+    "application/pdf",
+}
 if not os.path.exists(UPLOAD_DIR):
     os.makedirs(UPLOAD_DIR)
 
+def _insert_for(db: Session):
+    dialect = db.get_bind(mapper=AttachmentBlob).dialect.name
+    return sqlite.insert if dialect == "sqlite" else postgresql.insert
+
+def _lock_blob(db: Session, sha256: str):
+    # Serializes "is this blob file still needed?" between an upload and the
+    # cleanup after a delete; released when the transaction ends
+    if db.get_bind(mapper=AttachmentBlob).dialect.name == "postgresql":
+        db.execute(select(func.pg_advisory_xact_lock(func.hashtext(sha256))))
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def blob_path(sha256: str, filename: str) -> str:
+    # Extension kept for anyone browsing the blob directory
+    ext = os.path.splitext(filename)[1].lower()[:16]
+    return f"{BLOB_DIR}/{sha256[:2]}/{sha256}{ext}"
+
 class AttachmentService:
     @staticmethod
-    def upload_file(db: Session, file: UploadFile, entity_type: str, entity_id: uuid.UUID, is_public: bool = False, uploaded_by: str = None, description: str | None = None):
-        # Generate unique filename
-        unique_filename = f"{uuid.uuid4()}_{file.filename}"
-        disk_path = os.path.join(UPLOAD_DIR, unique_filename)
-        
-        # Save file
-        with open(disk_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        # Save to DB
+    def register_upload(db: Session, upload: ReceivedFile, entity_type: str, entity_id: uuid.UUID, is_public: bool = False, uploaded_by: str = None, description: str | None = None):
+        # One blob row per distinct content; a repeat upload only bumps ref_count
+        _lock_blob(db, upload.sha256)
+        stmt = _insert_for(db)(AttachmentBlob).values(
+            sha256=upload.sha256,
+            file_path=blob_path(upload.sha256, upload.filename),
+            size=upload.size,
+            ref_count=1,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AttachmentBlob.sha256],
+            set_={"ref_count": AttachmentBlob.ref_count + 1},
+        ).returning(AttachmentBlob.file_path)
+        file_path = db.execute(stmt).scalar_one()
+
         db_attachment = Attachment(
-            file_path=f"{UPLOAD_DIR}/{unique_filename}",
-            file_name=file.filename,
-            file_type=file.content_type,
+            file_path=file_path,
+            file_name=upload.filename,
+            file_type=upload.content_type,
             is_public=is_public,
             entity_type=entity_type,
             entity_id=entity_id,
             uploaded_by=uploaded_by,
-            description=description
+            description=description,
+            sha256=upload.sha256,
+            file_size=upload.size,
         )
         db.add(db_attachment)
-        db.commit()
+
+        # The file is in place before the row that points at it is committed
+        moved = False
+        if not os.path.exists(file_path):
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            os.replace(upload.temp_path, file_path)
+            moved = True
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            if moved:
+                _remove_file(file_path)
+            raise
         db.refresh(db_attachment)
         
         return db_attachment
 
+    @staticmethod
+    def get_attachment(db: Session, attachment_id: uuid.UUID):
+        return db.query(Attachment).filter(Attachment.id == attachment_id).first()
+
     @staticmethod
     def get_attachments(db: Session, entity_type: str, entity_id: uuid.UUID):
         return db.query(Attachment).filter(
@@ -50,10 +107,34 @@ class AttachmentService:
         if not attachment:
             return False
         
-        # Delete file
-        if os.path.exists(attachment.file_path):
-            os.remove(attachment.file_path)
+        sha256 = attachment.sha256
+        orphan = None if sha256 else attachment.file_path
+        if sha256:
+            blob = db.execute(
+                update(AttachmentBlob)
+                .where(AttachmentBlob.sha256 == sha256)
+                .values(ref_count=AttachmentBlob.ref_count - 1)
+                .returning(AttachmentBlob.ref_count, AttachmentBlob.file_path)
+            ).first()
+            if blob is not None and blob.ref_count <= 0:
+                db.execute(delete(AttachmentBlob).where(AttachmentBlob.sha256 == sha256))
+                orphan = blob.file_path
             
         db.delete(attachment)
         db.commit()
+
+        # Files go only once the rows are gone for good
+        if orphan and sha256:
+            AttachmentService._remove_unreferenced_blob(db, sha256, orphan)
+        elif orphan:
+            _remove_file(orphan)
         return True
+
+    @staticmethod
+    def _remove_unreferenced_blob(db: Session, sha256: str, file_path: str):
+        # An upload of the same bytes may have recreated the blob since our
+        # commit; it kept the existing file, so leave it alone in that case
+        _lock_blob(db, sha256)
+        if db.get(AttachmentBlob, sha256) is None:
+            _remove_file(file_path)
+        db.commit()
@@ -0,0 +1,63 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from .schemas import UserPrincipal
+
+USERS_CACHE = "users"
+
+PrincipalKey = Tuple[str, int]
+
+
+class PrincipalCache:
+    """
+    Bounded LRU of resolved users keyed by (token subject, token version).
+
+    Entries expire after `ttl` seconds and are dropped wholesale whenever the
+    "users" row in cache_versions changes, which update_user/delete_user bump
+    in the same transaction as the change itself. Callers read that row on
+    every lookup rather than waiting for the version poll, so deactivation
+    and password changes take effect on every worker right away.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[PrincipalKey, Tuple[UserPrincipal, float]]" = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: PrincipalKey, version: int) -> Optional[UserPrincipal]:
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+                return None
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            principal, stored_at = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def put(self, key: PrincipalKey, principal: UserPrincipal) -> None:
+        with self._lock:
+            self._entries[key] = (principal, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.AUTH_USER_CACHE_SIZE,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
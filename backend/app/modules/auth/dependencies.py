@@ -1,13 +1,18 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.cache import CacheVersion
+from .cache import principal_cache, USERS_CACHE
 from .models import User
-from .schemas import TokenData
+from .schemas import TokenData, UserPrincipal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
@@ -20,21 +25,41 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
+        token_data = TokenData(email=email, version=payload.get("ver", 0))
+    except (JWTError, ValidationError):
         raise credentials_exception
-    
+
+    key = (token_data.email, token_data.version)
+    # Primary-key read of the "users" version, cheaper than loading the user
+    users_version = db.query(CacheVersion.version).filter(CacheVersion.name == USERS_CACHE).scalar() or 0
+    principal = principal_cache.get(key, users_version)
+    if principal is not None:
+        return principal
+
     user = db.query(User).filter(User.email == token_data.email).first()
-    if user is None:
+    if user is None or user.token_version != token_data.version:
         raise credentials_exception
-    return user
+    principal = UserPrincipal.model_validate(user)
+    principal_cache.put(key, principal)
+    return principal
+
+def get_optional_user(
+    request: Request,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> Optional[UserPrincipal]:
+    # Browsers following a plain link send the session cookie, not a header
+    token = token or request.cookies.get("access_token")
+    if not token:
+        return None
+    return get_current_user(token, db)
 
-def get_current_active_user(current_user: User = Depends(get_current_user)):
+def get_current_active_user(current_user: UserPrincipal = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-def get_current_active_superuser(current_user: User = Depends(get_current_active_user)):
+def get_current_active_superuser(current_user: UserPrincipal = Depends(get_current_active_user)):
     if not current_user.is_superuser:
         raise HTTPException(status_code=400, detail="The user doesn't have enough privileges")
     return current_user
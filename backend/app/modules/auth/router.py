@@ -1,37 +1,59 @@
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core import config
-from app.core.database import get_db
+from app.core.cache import bump_version
+from app.core.database import get_db, get_async_db
 from jose import jwt
 from . import models, schemas, utils, dependencies
+from .cache import principal_cache, USERS_CACHE
+from .hashing import password_hasher, HasherBusy
 
 router = APIRouter()
 
+hasher_busy_exception = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many password operations in progress, please retry",
+    headers={"Retry-After": "1"},
+)
+
 @router.post("/login", response_model=schemas.Token)
-def login_access_token(
-    db: Session = Depends(get_db), 
+async def login_access_token(
+    db: AsyncSession = Depends(get_async_db), 
     form_data: OAuth2PasswordRequestForm = Depends(),
     remember_me: bool = False
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
-    if not user or not utils.verify_password(form_data.password, user.hashed_password):
+    result = await db.execute(select(models.User).where(models.User.email == form_data.username))
+    user = result.scalars().first()
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await password_hasher.verify(form_data.password, user.hashed_password)
+        except HasherBusy:
+            raise hasher_busy_exception
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect email or password",
         )
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    if new_hash:
+        # Stored hash predates the current bcrypt cost; upgrade it transparently
+        user.hashed_password = new_hash
+        await db.commit()
     
     access_token = utils.create_access_token(
-        data={"sub": user.email}, remember_me=remember_me
+        data={"sub": user.email, "ver": user.token_version}, remember_me=remember_me
     )
     refresh_token = utils.create_refresh_token(
-        data={"sub": user.email}, remember_me=remember_me
+        data={"sub": user.email, "ver": user.token_version}, remember_me=remember_me
     )
     
     return {
@@ -55,6 +77,7 @@ def refresh_token(
         email: str = payload.get("sub")
         token_type: str = payload.get("type")
         remember_me: bool = payload.get("remember_me", False)
+        token_version = payload.get("ver", 0)
         
         if email is None or token_type != "refresh":
              raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
@@ -64,13 +87,15 @@ def refresh_token(
     user = db.query(models.User).filter(models.User.email == email).first()
     if not user:
          raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if token_version != user.token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
          
     access_token = utils.create_access_token(
-        data={"sub": user.email}, remember_me=remember_me
+        data={"sub": user.email, "ver": user.token_version}, remember_me=remember_me
     )
     # Rotate refresh token
     new_refresh_token = utils.create_refresh_token(
-        data={"sub": user.email}, remember_me=remember_me
+        data={"sub": user.email, "ver": user.token_version}, remember_me=remember_me
     )
     
     return {
@@ -80,34 +105,38 @@ def refresh_token(
     }
 
 @router.post("/register", response_model=schemas.UserResponse)
-def register_user(
+async def register_user(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_in: schemas.UserCreate,
 ) -> Any:
     """
     Create new user.
     """
-    user = db.query(models.User).filter(models.User.email == user_in.email).first()
-    if user:
+    result = await db.execute(select(models.User).where(models.User.email == user_in.email))
+    if result.scalars().first():
         raise HTTPException(
             status_code=400,
             detail="The user with this username already exists in the system.",
         )
+    try:
+        hashed_password = await password_hasher.hash(user_in.password)
+    except HasherBusy:
+        raise hasher_busy_exception
     user = models.User(
         email=user_in.email,
-        hashed_password=utils.get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         full_name=user_in.full_name,
         is_superuser=user_in.is_superuser,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 @router.get("/me", response_model=schemas.UserResponse)
 def read_users_me(
-    current_user: models.User = Depends(dependencies.get_current_active_user),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
 ) -> Any:
     """
     Get current user.
@@ -119,7 +148,7 @@ def read_users(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_superuser),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
 ) -> Any:
     """
     Retrieve users.
@@ -128,31 +157,40 @@ def read_users(
     return users
 
 @router.put("/users/{user_id}", response_model=schemas.UserResponse)
-def update_user(
+async def update_user(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: int,
     user_in: schemas.UserUpdate,
-    current_user: models.User = Depends(dependencies.get_current_active_superuser),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
 ) -> Any:
     """
     Update a user.
     """
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await db.get(models.User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     update_data = user_in.dict(exclude_unset=True)
     if "password" in update_data:
-        update_data["hashed_password"] = utils.get_password_hash(update_data["password"])
+        try:
+            update_data["hashed_password"] = await password_hasher.hash(update_data["password"])
+        except HasherBusy:
+            raise hasher_busy_exception
         del update_data["password"]
     
+    # A new password or deactivation revokes the tokens already issued
+    if "hashed_password" in update_data or update_data.get("is_active") is False:
+        user.token_version = models.User.token_version + 1
+
     for field, value in update_data.items():
         setattr(user, field, value)
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.run_sync(bump_version, USERS_CACHE)
+    await db.commit()
+    await db.refresh(user)
+    principal_cache.invalidate()
     return user
 
 @router.delete("/users/{user_id}", response_model=schemas.UserResponse)
@@ -160,7 +198,7 @@ def delete_user(
     *,
     db: Session = Depends(get_db),
     user_id: int,
-    current_user: models.User = Depends(dependencies.get_current_active_superuser),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
 ) -> Any:
     """
     Soft delete a user.
@@ -171,7 +209,10 @@ def delete_user(
     
     user.is_deleted = True
     user.is_active = False # Also deactivate
+    user.token_version = models.User.token_version + 1
     db.add(user)
+    bump_version(db, USERS_CACHE)
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate()
     return user
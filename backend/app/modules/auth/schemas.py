@@ -8,6 +8,7 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    version: int = 0
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -35,3 +36,6 @@ class UserResponse(UserBase):
     
     class Config:
         from_attributes = True
+
+class UserPrincipal(UserResponse):
+    token_version: int = 0
@@ -1,12 +1,12 @@
-from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
 from typing import Union
 from jose import jwt
 from app.core.config import settings
+from .hashing import pwd_context
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 ALGORITHM = settings.ALGORITHM
 
+# Synchronous helpers for scripts; request handlers go through hashing.password_hasher
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, UUID, Text, Integer
+from sqlalchemy import Column, String, DateTime, UUID, Text, Integer, Index
 from sqlalchemy.sql import func
 import uuid
 from app.core.database import Base
@@ -22,3 +22,6 @@ class Call(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+# Call log of one record
+Index("ix_calls_entity_created_at", Call.entity_type, Call.entity_id, Call.created_at.desc())
@@ -3,10 +3,14 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 import uuid
 from app.core.database import get_db
+from app.core.serialization import fast_json_response
+from pydantic import TypeAdapter
 from . import schemas, services
 
 router = APIRouter()
 
+CALL_LIST = TypeAdapter(List[schemas.CallResponse])
+
 @router.post("/", response_model=schemas.CallResponse)
 def create_call(call: schemas.CallCreate, db: Session = Depends(get_db)):
     return services.CallService.create_call(db=db, call=call)
@@ -22,11 +26,11 @@ def read_calls(
     if entity_type and entity_id:
         try:
             e_id = uuid.UUID(entity_id)
-            return services.CallService.get_calls_by_entity(db, entity_type, e_id)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid entity_id")
+        return fast_json_response(CALL_LIST, services.CallService.get_calls_by_entity(db, entity_type, e_id))
             
-    return services.CallService.get_calls(db, skip=skip, limit=limit)
+    return fast_json_response(CALL_LIST, services.CallService.get_calls(db, skip=skip, limit=limit))
 
 @router.get("/{call_id}", response_model=schemas.CallResponse)
 def read_call(call_id: uuid.UUID, db: Session = Depends(get_db)):
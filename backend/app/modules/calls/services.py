@@ -24,7 +24,8 @@ class CallService:
 
     @staticmethod
     def get_calls(db: Session, skip: int = 0, limit: int = 100):
-        return db.query(Call).offset(skip).limit(limit).all()
+        rows = db.query(*Call.__table__.columns).offset(skip).limit(limit).all()
+        return [dict(row._mapping) for row in rows]
 
     @staticmethod
     def get_call(db: Session, call_id: uuid.UUID):
@@ -32,10 +33,11 @@ class CallService:
 
     @staticmethod
     def get_calls_by_entity(db: Session, entity_type: str, entity_id: uuid.UUID):
-        return db.query(Call).filter(
+        rows = db.query(*Call.__table__.columns).filter(
             Call.entity_type == entity_type,
             Call.entity_id == entity_id
         ).all()
+        return [dict(row._mapping) for row in rows]
 
     @staticmethod
     def update_call(db: Session, call_id: uuid.UUID, call_update: CallUpdate):
@@ -1,23 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_async_db
+from app.core.export import export_response
+from app.core.serialization import fast_json_response
+from pydantic import TypeAdapter
 from . import schemas, services
 import uuid
 
 router = APIRouter()
 
+CONTACT_LIST = TypeAdapter(List[schemas.ContactResponse])
+
 @router.post("", response_model=schemas.ContactResponse, status_code=201)
 def create_contact(contact: schemas.ContactCreate, db: Session = Depends(get_db)):
     return services.ContactService.create_contact(db, contact)
 
 @router.get("", response_model=List[schemas.ContactResponse])
-def read_contacts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return services.ContactService.get_contacts(db, skip=skip, limit=limit)
+async def read_contacts(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    contacts = await services.AsyncContactService.get_contacts(db, skip=skip, limit=limit)
+    return fast_json_response(CONTACT_LIST, contacts)
+
+@router.get("/export")
+def export_contacts(format: str = Query("csv", pattern="^(csv|ndjson)$")):
+    return export_response(
+        services.ContactService.export_contacts,
+        list(schemas.ContactResponse.model_fields),
+        format,
+        "contacts",
+    )
 
 @router.get("/{contact_id}", response_model=schemas.ContactResponse)
-def read_contact(contact_id: str, db: Session = Depends(get_db)):
-    contact = services.ContactService.get_contact(db, uuid.UUID(contact_id))
+async def read_contact(contact_id: str, db: AsyncSession = Depends(get_async_db)):
+    contact = await services.AsyncContactService.get_contact(db, uuid.UUID(contact_id))
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     return contact
@@ -1,7 +1,11 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from . import models, schemas
 import uuid
-from typing import List, Optional
+from typing import Iterator, List, Optional
+from app.core.export import EXPORT_BATCH_SIZE
+from app.core.database import replica_read
 
 class ContactService:
     @staticmethod
@@ -9,9 +13,18 @@ class ContactService:
         return db.query(models.Contact).filter(models.Contact.id == contact_id).first()
 
     @staticmethod
+    @replica_read
     def get_contacts(db: Session, skip: int = 0, limit: int = 100) -> List[models.Contact]:
         return db.query(models.Contact).offset(skip).limit(limit).all()
 
+    @staticmethod
+    @replica_read
+    def export_contacts(db: Session) -> Iterator[dict]:
+        query = db.query(*models.Contact.__table__.columns)
+        query = query.order_by(models.Contact.created_at.desc(), models.Contact.id.desc()).yield_per(EXPORT_BATCH_SIZE)
+        for row in query:
+            yield dict(row._mapping)
+
     @staticmethod
     def create_contact(db: Session, contact: schemas.ContactCreate) -> models.Contact:
         db_contact = models.Contact(**contact.dict())
@@ -43,3 +56,15 @@ class ContactService:
         db.delete(db_contact)
         db.commit()
         return True
+
+
+class AsyncContactService:
+    @staticmethod
+    async def get_contact(db: AsyncSession, contact_id: uuid.UUID) -> Optional[models.Contact]:
+        return await db.get(models.Contact, contact_id)
+
+    @staticmethod
+    @replica_read
+    async def get_contacts(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[dict]:
+        result = await db.execute(select(*models.Contact.__table__.columns).offset(skip).limit(limit))
+        return [dict(row._mapping) for row in result]
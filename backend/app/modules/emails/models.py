@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, UUID, Text
+from sqlalchemy import Column, String, DateTime, UUID, Text, Index
 from sqlalchemy.sql import func
 import uuid
 from app.core.database import Base
@@ -17,3 +17,6 @@ class EmailLog(Base):
     
     sent_by = Column(String, nullable=True)
     sent_at = Column(DateTime(timezone=True), server_default=func.now())
+
+# Email history of one record, by sent_at
+Index("ix_email_logs_entity_sent_at", EmailLog.entity_type, EmailLog.entity_id, EmailLog.sent_at.desc())
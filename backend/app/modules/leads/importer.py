@@ -0,0 +1,212 @@
+import codecs
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.modules.activities.services import ActivityService
+from app.modules.master_data.cache import master_data_cache
+from .models import Lead
+from .rollups import LeadRollupService
+from .schemas import LeadCreate
+from .services import LEAD_LABEL_COLUMNS
+
+COLUMNS = ["id"] + list(LeadCreate.model_fields)
+MAX_REPORTED_ERRORS = 1000
+
+
+def _iter_csv(stream: BinaryIO) -> Iterator[Union[dict, Exception]]:
+    reader = csv.DictReader(codecs.getreader("utf-8-sig")(stream))
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # Malformed rows are reported instead of aborting the import
+            yield e
+            continue
+        yield {key: (value if value != "" else None) for key, value in row.items() if key}
+
+
+def _iter_ndjson(stream: BinaryIO) -> Iterator[Union[dict, Exception]]:
+    for line in codecs.getreader("utf-8-sig")(stream):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield e
+
+
+def _chunks(rows: Iterator[Tuple[int, dict]], size: int) -> Iterator[List[Tuple[int, dict]]]:
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class LeadImportService:
+    @staticmethod
+    def detect_format(filename: Optional[str], requested: Optional[str] = None) -> str:
+        if requested:
+            return requested.lower()
+        if filename and filename.lower().endswith((".ndjson", ".jsonl")):
+            return "ndjson"
+        return "csv"
+
+    @staticmethod
+    def import_leads(db: Session, stream: BinaryIO, fmt: str = "csv", user_id: int = None):
+        reader = _iter_ndjson(stream) if fmt == "ndjson" else _iter_csv(stream)
+
+        total = imported = failed = 0
+        errors = []
+
+        def report(row_number: int, messages: List[str]):
+            nonlocal failed
+            failed += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"row": row_number, "errors": messages})
+
+        def numbered():
+            # Row numbers are 1-based data rows, header excluded
+            nonlocal total
+            for row_number, raw in enumerate(reader, start=1):
+                total += 1
+                if isinstance(raw, Exception):
+                    report(row_number, [f"Malformed row: {raw}"])
+                    continue
+                yield row_number, raw
+
+        for chunk in _chunks(numbered(), settings.LEAD_IMPORT_CHUNK_SIZE):
+            rows = []
+            for row_number, raw in chunk:
+                values, messages = LeadImportService._validate_row(raw)
+                if messages:
+                    report(row_number, messages)
+                else:
+                    rows.append((row_number, values))
+
+            if not rows:
+                continue
+            try:
+                LeadImportService._insert_rows(db, [values for _, values in rows])
+                LeadRollupService.add_leads(db, [values["id"] for _, values in rows])
+                db.commit()
+                imported += len(rows)
+            except Exception:
+                db.rollback()
+                # Retry the chunk row by row to pin the failure on the offending rows
+                for row_number, values in rows:
+                    try:
+                        db.execute(insert(Lead), [values])
+                        LeadRollupService.add_leads(db, [values["id"]])
+                        db.commit()
+                        imported += 1
+                    except Exception as e:
+                        db.rollback()
+                        report(row_number, [f"Database error: {e.__class__.__name__}"])
+
+        import_id = uuid.uuid4()
+        ActivityService.log_activity(
+            db=db,
+            action_type="IMPORT",
+            entity_type="LEAD_IMPORT",
+            entity_id=import_id,
+            description=f"Imported {imported} of {total} leads ({failed} failed).",
+            user_id=user_id
+        )
+        db.commit()
+
+        return {
+            "import_id": import_id,
+            "total": total,
+            "imported": imported,
+            "failed": failed,
+            "errors": sorted(errors, key=lambda error: error["row"]),
+            "errors_truncated": failed > len(errors),
+        }
+
+    @staticmethod
+    def _validate_row(raw: dict):
+        if not isinstance(raw, dict):
+            return None, ["Row must be an object"]
+
+        messages = []
+        data = {key: value for key, value in raw.items() if key in LeadCreate.model_fields}
+        for column, table in LEAD_LABEL_COLUMNS.items():
+            value = data.get(column)
+            if value in (None, ""):
+                data[column] = None
+                continue
+            resolved = master_data_cache.resolve_id(table, value)
+            if resolved is None:
+                messages.append(f"Unknown {column} '{value}'")
+            data[column] = resolved
+
+        # LeadCreate accepts loose strings for these; the columns do not
+        if data.get("probability") not in (None, ""):
+            try:
+                data["probability"] = int(data["probability"])
+            except (TypeError, ValueError):
+                messages.append("probability: must be an integer")
+        if isinstance(data.get("closing_date"), str):
+            try:
+                data["closing_date"] = datetime.fromisoformat(data["closing_date"])
+            except ValueError:
+                messages.append("closing_date: must be an ISO 8601 date")
+
+        if messages:
+            return None, messages
+        try:
+            lead = LeadCreate(**data)
+        except ValidationError as e:
+            return None, [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()]
+
+        values = lead.model_dump()
+        values["id"] = uuid.uuid4()
+        return values, []
+
+    @staticmethod
+    def _insert_rows(db: Session, rows: List[dict]):
+        connection = db.connection()
+        if connection.dialect.driver == "psycopg2":
+            LeadImportService._copy_rows(connection, rows)
+        else:
+            connection.execute(insert(Lead), rows)
+
+    @staticmethod
+    def _copy_rows(connection, rows: List[dict]):
+        # COPY ... FROM STDIN on the session's own DBAPI connection, so the
+        # chunk commits or rolls back together with the session transaction
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                "" if row[column] is None
+                else row[column].isoformat() if hasattr(row[column], "isoformat")
+                else row[column]
+                for column in COLUMNS
+            ])
+        buffer.seek(0)
+
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY leads ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
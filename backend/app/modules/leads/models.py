@@ -1,12 +1,19 @@
-from sqlalchemy import Column, String, DateTime, UUID, Float, Integer, ForeignKey, cast
+from sqlalchemy import Column, String, Date, DateTime, UUID, Float, Integer, ForeignKey, Index, cast
 from sqlalchemy.orm import relationship, foreign, remote
 
 from sqlalchemy.sql import func
 import uuid
 from app.core.database import Base
+from app.modules.master_data.cache import master_data_cache
 
 class Lead(Base):
     __tablename__ = "leads"
+    __table_args__ = (
+        # Keyset pagination order for GET /leads
+        Index("ix_leads_created_at_id", "created_at", "id"),
+        # Lead / Opportunity / Deal bucket listings
+        Index("ix_leads_status_created_at", "status", "created_at"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     # Loosening FK constraints for initial migration as profiles/branches might not exist in swcrm yet
@@ -39,6 +46,10 @@ class Lead(Base):
     estimated_revenue = Column(Float, nullable=True) # Perkiraan Omzet
     probability = Column(Integer, nullable=True) # Probability (percentage)
     closing_date = Column(DateTime(timezone=True), nullable=True) # Perkiraan Closing Date for Deals
+    # Stamped by status changes: first move out of the Lead stage, and
+    # reaching a closed status (cleared again if the deal is reopened)
+    qualified_at = Column(DateTime(timezone=True), nullable=True)
+    closed_at = Column(DateTime(timezone=True), nullable=True)
 
 
 
@@ -46,28 +57,53 @@ class Lead(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     deleted_at = Column(DateTime(timezone=True), nullable=True)
 
-    status_rel = relationship("MasterLeadStatus", lazy="joined")
-    salutation_rel = relationship("MasterSalutation", lazy="joined")
-    industry_rel = relationship("MasterIndustry", lazy="joined")
-    no_employees_rel = relationship("MasterEmployeeCount", lazy="joined")
-    source_rel = relationship("MasterSource", lazy="joined")
+    # Labels come from the master data cache; the relationships are only
+    # loaded when a query asks for them explicitly
+    status_rel = relationship("MasterLeadStatus", lazy="raise")
+    salutation_rel = relationship("MasterSalutation", lazy="raise")
+    industry_rel = relationship("MasterIndustry", lazy="raise")
+    no_employees_rel = relationship("MasterEmployeeCount", lazy="raise")
+    source_rel = relationship("MasterSource", lazy="raise")
 
     @property
     def status_label(self):
-        return self.status_rel.name if self.status_rel else None
+        return master_data_cache.name_for_id("master_lead_status", self.status)
 
     @property
     def salutation_label(self):
-        return self.salutation_rel.name if self.salutation_rel else None
+        return master_data_cache.name_for_id("master_salutations", self.salutation)
 
     @property
     def industry_label(self):
-        return self.industry_rel.name if self.industry_rel else None
+        return master_data_cache.name_for_id("master_industries", self.industry)
 
     @property
     def no_employees_label(self):
-        return self.no_employees_rel.name if self.no_employees_rel else None
+        return master_data_cache.name_for_id("master_employee_counts", self.no_employees)
 
     @property
     def source_label(self):
-        return self.source_rel.name if self.source_rel else None
+        return master_data_cache.name_for_id("master_sources", self.source)
+
+
+class LeadPipelineRollup(Base):
+    """
+    Dashboard counters per day x status x source x owner x branch, kept in step
+    with the leads table by LeadRollupService. NULL dimensions are stored as
+    the nil UUID so every bucket has a proper primary key.
+    """
+    __tablename__ = "lead_pipeline_rollups"
+
+    day = Column(Date, primary_key=True)  # UTC date of leads.created_at
+    status = Column(UUID(as_uuid=True), primary_key=True)
+    source = Column(UUID(as_uuid=True), primary_key=True)
+    owner_id = Column(UUID(as_uuid=True), primary_key=True)
+    branch_id = Column(UUID(as_uuid=True), primary_key=True)
+
+    lead_count = Column(Integer, nullable=False, default=0)
+    revenue_sum = Column(Float, nullable=False, default=0)
+    # Close-time sums; the stats decide per status which of them count
+    lead_close_seconds = Column(Float, nullable=False, default=0)
+    lead_close_count = Column(Integer, nullable=False, default=0)
+    deal_close_seconds = Column(Float, nullable=False, default=0)
+    deal_close_count = Column(Integer, nullable=False, default=0)
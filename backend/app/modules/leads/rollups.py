@@ -0,0 +1,193 @@
+import uuid
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheVersion, bump_version
+from .models import Lead, LeadPipelineRollup
+
+# Stands in for NULL dimensions, which cannot be part of the primary key
+NO_VALUE = uuid.UUID(int=0)
+
+KEY_COLUMNS = ("day", "status", "source", "owner_id", "branch_id")
+MEASURES = (
+    "lead_count",
+    "revenue_sum",
+    "lead_close_seconds",
+    "lead_close_count",
+    "deal_close_seconds",
+    "deal_close_count",
+)
+# Lead attributes a bucket is computed from
+ROLLUP_ATTRIBUTES = [
+    "created_at",
+    "qualified_at",
+    "closed_at",
+    "closing_date",
+    "status",
+    "source",
+    "owner_id",
+    "branch_id",
+    "estimated_revenue",
+]
+REBUILD_BATCH_SIZE = 5000
+# cache_versions row bumped by every rebuild; until it exists the table only
+# holds deltas recorded since deploy
+REBUILT_MARKER = "lead_pipeline_rollups"
+
+RollupKey = Tuple[date, uuid.UUID, uuid.UUID, uuid.UUID, uuid.UUID]
+Contribution = Tuple[RollupKey, Dict[str, float]]
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _seconds(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+    if start is None or end is None or end < start:
+        return None
+    return (end - start).total_seconds()
+
+
+def _insert_for(db: Session):
+    dialect = db.get_bind(mapper=LeadPipelineRollup).dialect.name
+    return sqlite.insert if dialect == "sqlite" else postgresql.insert
+
+
+class LeadRollupService:
+    """
+    Incremental maintenance of lead_pipeline_rollups.
+
+    Every lead contributes its measures to exactly one bucket. Mutations
+    subtract the lead's old contribution and add the new one inside the
+    caller's transaction, so the rollups commit or roll back with the lead.
+    """
+
+    @staticmethod
+    def contribution(lead) -> Optional[Contribution]:
+        # Works on Lead instances and on rows selected with ROLLUP_ATTRIBUTES
+        created_at = _utc(lead.created_at)
+        if created_at is None:
+            return None
+        lead_seconds = _seconds(created_at, _utc(lead.qualified_at))
+        # Deals closed before closed_at existed fall back to their closing date
+        deal_seconds = _seconds(created_at, _utc(lead.closed_at) or _utc(lead.closing_date))
+
+        key = (
+            created_at.date(),
+            lead.status or NO_VALUE,
+            lead.source or NO_VALUE,
+            lead.owner_id or NO_VALUE,
+            lead.branch_id or NO_VALUE,
+        )
+        return key, {
+            "lead_count": 1,
+            "revenue_sum": lead.estimated_revenue or 0.0,
+            "lead_close_seconds": lead_seconds or 0.0,
+            "lead_close_count": 0 if lead_seconds is None else 1,
+            "deal_close_seconds": deal_seconds or 0.0,
+            "deal_close_count": 0 if deal_seconds is None else 1,
+        }
+
+    @staticmethod
+    def snapshot(db: Session, lead: Lead) -> Optional[Contribution]:
+        # Flush pending changes and reload the server-computed timestamps
+        # (the created_at default) before reading them
+        db.flush()
+        db.refresh(lead, ROLLUP_ATTRIBUTES)
+        return LeadRollupService.contribution(lead)
+
+    @staticmethod
+    def record_change(db: Session, before: Optional[Contribution], after: Optional[Contribution]) -> None:
+        deltas: Dict[RollupKey, Dict[str, float]] = {}
+        for contribution, sign in ((before, -1), (after, 1)):
+            if contribution is None:
+                continue
+            key, measures = contribution
+            bucket = deltas.setdefault(key, dict.fromkeys(MEASURES, 0))
+            for measure, value in measures.items():
+                bucket[measure] += sign * value
+        LeadRollupService.apply(db, deltas)
+
+    @staticmethod
+    def add_leads(db: Session, lead_ids: Iterable[uuid.UUID]) -> None:
+        # Bulk paths (import) insert rows directly; fold them in afterwards
+        lead_ids = list(lead_ids)
+        if not lead_ids:
+            return
+        columns = [getattr(Lead, name) for name in ROLLUP_ATTRIBUTES]
+        rows = db.query(*columns).filter(Lead.id.in_(lead_ids)).all()
+        LeadRollupService.apply(db, LeadRollupService._accumulate(rows))
+
+    @staticmethod
+    def apply(db: Session, deltas: Dict[RollupKey, Dict[str, float]]) -> None:
+        # Sorted keys keep concurrent writers locking buckets in the same order
+        rows = [
+            {**dict(zip(KEY_COLUMNS, key)), **measures}
+            for key, measures in sorted(deltas.items(), key=lambda item: tuple(str(part) for part in item[0]))
+            if any(measures.values())
+        ]
+        if not rows:
+            return
+        stmt = _insert_for(db)(LeadPipelineRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(KEY_COLUMNS),
+            set_={
+                measure: getattr(LeadPipelineRollup, measure) + getattr(stmt.excluded, measure)
+                for measure in MEASURES
+            },
+        )
+        db.execute(stmt, rows)
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Recompute every bucket from the leads table. The caller commits."""
+        LeadRollupService._lock(db)
+        db.execute(delete(LeadPipelineRollup))
+
+        columns = [getattr(Lead, name) for name in ROLLUP_ATTRIBUTES]
+        rows = db.query(*columns).yield_per(REBUILD_BATCH_SIZE)
+        deltas = LeadRollupService._accumulate(rows)
+        LeadRollupService.apply(db, deltas)
+        bump_version(db, REBUILT_MARKER)
+        return len(deltas)
+
+    @staticmethod
+    def ensure_built(db: Session) -> Optional[int]:
+        """
+        Rebuild once if the rollups were never built from the leads table, as
+        on the first start after deploying them. The caller commits.
+        """
+        # Workers starting together queue on the lock; the first one rebuilds
+        # and the rest then find the marker
+        LeadRollupService._lock(db)
+        if db.query(CacheVersion.version).filter(CacheVersion.name == REBUILT_MARKER).scalar():
+            return None
+        return LeadRollupService.rebuild(db)
+
+    @staticmethod
+    def _lock(db: Session) -> None:
+        if db.get_bind(mapper=LeadPipelineRollup).dialect.name == "postgresql":
+            # Writers block on the rollups until the rebuild commits, so no
+            # delta is lost between the wipe and the recount
+            db.execute(text("LOCK TABLE lead_pipeline_rollups IN EXCLUSIVE MODE"))
+
+    @staticmethod
+    def _accumulate(rows) -> Dict[RollupKey, Dict[str, float]]:
+        deltas: Dict[RollupKey, Dict[str, float]] = {}
+        for row in rows:
+            contribution = LeadRollupService.contribution(row)
+            if contribution is None:
+                continue
+            key, measures = contribution
+            bucket = deltas.setdefault(key, dict.fromkeys(MEASURES, 0))
+            for measure, value in measures.items():
+                bucket[measure] += value
+        return deltas
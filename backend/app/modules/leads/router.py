@@ -1,31 +1,115 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile, Form
 from typing import Optional, List
+from datetime import datetime
 
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from .schemas import LeadCreate, LeadResponse
-from .services import LeadService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_async_db
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor
+from app.core.export import export_response
+from app.core.serialization import fast_json_response
+from pydantic import TypeAdapter
+from .schemas import LeadCreate, LeadResponse, LeadPage, LeadImportResult, LeadStats
+from .services import LeadService, AsyncLeadService
+from .importer import LeadImportService
+from .stats import LeadStatsService, DEFAULT_TREND_DAYS, MAX_TREND_DAYS
 import uuid
 
 router = APIRouter()
 
+LEAD_EXPORT_FIELDS = list(LeadResponse.model_fields)
+LEAD_PAGE = TypeAdapter(LeadPage)
+LEAD_LIST = TypeAdapter(List[LeadResponse])
+
 @router.post("", status_code=201)
 def create_lead(lead: LeadCreate, db: Session = Depends(get_db)):
     db_lead = LeadService.create_lead(db, lead)
     return {"success": True, "id": str(db_lead.id)}
 
-@router.get("", response_model=List[LeadResponse])
-def read_leads(status: Optional[str] = Query(None), db: Session = Depends(get_db)):
-    return LeadService.get_leads(db, status=status)
+@router.post("/import", response_model=LeadImportResult)
+def import_leads(
+    file: UploadFile = File(...),
+    format: Optional[str] = Form(None),
+    db: Session = Depends(get_db)
+):
+    fmt = LeadImportService.detect_format(file.filename, format)
+    if fmt not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="Format must be csv or ndjson")
+    return LeadImportService.import_leads(db, file.file, fmt)
+
+def lead_filters(
+    status: Optional[str] = Query(None),
+    owner_id: Optional[uuid.UUID] = None,
+    branch_id: Optional[uuid.UUID] = None,
+    source: Optional[uuid.UUID] = None,
+    industry: Optional[uuid.UUID] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    closing_from: Optional[datetime] = None,
+    closing_to: Optional[datetime] = None,
+) -> dict:
+    return {
+        "status": status,
+        "owner_id": owner_id,
+        "branch_id": branch_id,
+        "source": source,
+        "industry": industry,
+        "created_from": created_from,
+        "created_to": created_to,
+        "closing_from": closing_from,
+        "closing_to": closing_to,
+    }
+
+@router.get("", response_model=LeadPage)
+async def read_leads(
+    filters: dict = Depends(lead_filters),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        page = await AsyncLeadService.get_leads(db, cursor=cursor, limit=limit, **filters)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return fast_json_response(LEAD_PAGE, page)
+
+@router.get("/export")
+def export_leads(
+    filters: dict = Depends(lead_filters),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+):
+    return export_response(
+        lambda db: LeadService.export_leads(db, **filters),
+        LEAD_EXPORT_FIELDS,
+        format,
+        "leads",
+    )
 
+@router.get("/stats", response_model=LeadStats)
+async def read_lead_stats(
+    owner_id: Optional[uuid.UUID] = None,
+    branch_id: Optional[uuid.UUID] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    trend_days: int = Query(DEFAULT_TREND_DAYS, ge=1, le=MAX_TREND_DAYS),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await LeadStatsService.get_stats(
+        db,
+        owner_id=owner_id,
+        branch_id=branch_id,
+        created_from=created_from,
+        created_to=created_to,
+        trend_days=trend_days,
+    )
 
 @router.get("/deals", response_model=List[LeadResponse])
-def read_deal_leads(db: Session = Depends(get_db)):
-    return LeadService.get_deals_leads(db)
+async def read_deal_leads(db: AsyncSession = Depends(get_async_db)):
+    return fast_json_response(LEAD_LIST, await AsyncLeadService.get_deals_leads(db))
 
 @router.get("/{lead_id}", response_model=LeadResponse)
-def read_lead(lead_id: str, db: Session = Depends(get_db)):
-    lead = LeadService.get_lead(db, uuid.UUID(lead_id))
+async def read_lead(lead_id: str, db: AsyncSession = Depends(get_async_db)):
+    lead = await AsyncLeadService.get_lead(db, uuid.UUID(lead_id))
     if not lead:
         return {"error": "Lead not found"}
     return lead
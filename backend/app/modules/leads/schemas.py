@@ -1,7 +1,7 @@
 from pydantic import BaseModel, computed_field
-from typing import Optional, Union, Any
+from typing import Optional, Union, Any, List
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 
 class LeadCreate(BaseModel):
     # ... existing fields ...
@@ -41,3 +41,53 @@ class LeadResponse(LeadCreate):
     
     class Config:
         from_attributes = True
+
+class LeadPage(BaseModel):
+    items: List[LeadResponse]
+    next_cursor: Optional[str] = None
+    limit: int
+
+class LeadImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+class LeadImportResult(BaseModel):
+    import_id: uuid.UUID
+    total: int
+    imported: int
+    failed: int
+    errors: List[LeadImportError]
+    errors_truncated: bool = False
+
+class LeadStatusCount(BaseModel):
+    id: Optional[uuid.UUID] = None
+    name: str
+    stage_group: Optional[str] = None
+    color: Optional[str] = None
+    count: int
+    revenue: float
+
+class LeadSourceCount(BaseModel):
+    id: Optional[uuid.UUID] = None
+    name: str
+    count: int
+
+class LeadTrendPoint(BaseModel):
+    date: date
+    leads: int
+    deals: int
+    won: int
+
+class LeadStats(BaseModel):
+    total: int
+    total_leads: int
+    total_opportunities: int
+    ongoing_deals: int
+    won_deals: int
+    won_revenue: float
+    avg_deal_value: float
+    avg_lead_close_days: Optional[float] = None
+    avg_deal_close_days: Optional[float] = None
+    by_status: List[LeadStatusCount]
+    by_source: List[LeadSourceCount]
+    trend: List[LeadTrendPoint]
@@ -1,103 +1,186 @@
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from .models import Lead
 from .schemas import LeadCreate
+from .rollups import LeadRollupService
 from app.modules.activities.services import ActivityService
-from app.modules.master_data.models import MasterLeadStatus
+from app.modules.master_data.cache import master_data_cache
+from app.modules.master_data.models import CLOSED_LEAD_STATUSES, LEAD_STAGE_GROUPS
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, keyset_page
+from app.core.export import EXPORT_BATCH_SIZE
+from app.core.database import replica_read
+from datetime import datetime, timezone
 import uuid
 
+# Lead column -> master table holding its label
+LEAD_LABEL_COLUMNS = {
+    "status": "master_lead_status",
+    "salutation": "master_salutations",
+    "industry": "master_industries",
+    "no_employees": "master_employee_counts",
+    "source": "master_sources",
+}
+
 class LeadService:
     @staticmethod
     def create_lead(db: Session, lead: LeadCreate):
         # Ensure default status 'New' is mapped to ID if not provided or string
         if isinstance(lead.status, str):
-             status_obj = db.query(MasterLeadStatus).filter(MasterLeadStatus.name == lead.status).first()
-             if status_obj:
-                 lead.status = status_obj.id
+             status_id = master_data_cache.id_for_name("master_lead_status", lead.status)
+             if status_id:
+                 lead.status = status_id
         
-        db_lead = Lead(**lead.dict())
+        db_lead = Lead(id=uuid.uuid4(), **lead.dict())
         db.add(db_lead)
-        db.commit()
-        db.refresh(db_lead)
+        LeadRollupService.record_change(db, None, LeadRollupService.snapshot(db, db_lead))
         
-        # Log Activity
+        # Log Activity (committed together with the lead)
         ActivityService.log_activity(
             db=db,
             action_type="CREATE",
             entity_type="LEAD",
-            entity_id=str(db_lead.id),
+            entity_id=db_lead.id,
             description=f"Lead {db_lead.first_name} created.",
             user_id=None # Default system or catch from context if available
         )
         
+        db.commit()
+        db.refresh(db_lead)
         return db_lead
 
     @staticmethod
-    def get_leads(db: Session, status: str = None):
-        deal_status_names = ["Proposal", "Negotiation", "Closed Won", "Closed Lost"]
-        opportunity_status_names = ["Qualified"]
-        lead_status_names = ["New", "Attempted to Contact", "Contacted", "Unqualified"]
-        
-        query = db.query(Lead)
-        
+    def apply_filters(
+        query,
+        status: str = None,
+        owner_id: uuid.UUID = None,
+        branch_id: uuid.UUID = None,
+        source: uuid.UUID = None,
+        industry: uuid.UUID = None,
+        created_from: datetime = None,
+        created_to: datetime = None,
+        closing_from: datetime = None,
+        closing_to: datetime = None,
+    ):
         if status:
-            if status == "Opportunity":
-                 status_ids = db.query(MasterLeadStatus.id).filter(MasterLeadStatus.name.in_(opportunity_status_names)).all()
-                 status_ids = [s[0] for s in status_ids]
-                 query = query.filter(Lead.status.in_(status_ids))
-            elif status == "Deal": 
-                 status_ids = db.query(MasterLeadStatus.id).filter(MasterLeadStatus.name.in_(deal_status_names)).all()
-                 status_ids = [s[0] for s in status_ids]
-                 query = query.filter(Lead.status.in_(status_ids))
-            elif status == "Lead":
-                 status_ids = db.query(MasterLeadStatus.id).filter(MasterLeadStatus.name.in_(lead_status_names)).all()
-                 status_ids = [s[0] for s in status_ids]
+            if status in LEAD_STAGE_GROUPS:
+                 # Lead / Opportunity / Deal bucket, resolved from the cached stage groups
+                 status_ids = master_data_cache.ids_for_stage_group(status)
                  query = query.filter(Lead.status.in_(status_ids))
             else:
-                 # Check if status is ID or Name
-                 if status.isdigit():
-                     query = query.filter(Lead.status == int(status))
-                 else:
-                     # Try to find ID for name
-                     status_obj = db.query(MasterLeadStatus).filter(MasterLeadStatus.name == status).first()
-                     if status_obj:
-                         query = query.filter(Lead.status == status_obj.id)
-        
-        return query.all()
+                 # Status may be an ID or a name
+                 status_id = master_data_cache.resolve_id("master_lead_status", status)
+                 if status_id:
+                     query = query.filter(Lead.status == status_id)
 
+        if owner_id:
+            query = query.filter(Lead.owner_id == owner_id)
+        if branch_id:
+            query = query.filter(Lead.branch_id == branch_id)
+        if source:
+            query = query.filter(Lead.source == source)
+        if industry:
+            query = query.filter(Lead.industry == industry)
+        if created_from:
+            query = query.filter(Lead.created_at >= created_from)
+        if created_to:
+            query = query.filter(Lead.created_at < created_to)
+        if closing_from:
+            query = query.filter(Lead.closing_date >= closing_from)
+        if closing_to:
+            query = query.filter(Lead.closing_date < closing_to)
+        return query
 
     @staticmethod
+    def keyset_query(query, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        # Keyset pagination on (created_at, id), newest first; works on both
+        # Query and select() so the async service shares it
+        after = decode_cursor(cursor)
+        if after:
+            query = query.filter(tuple_(Lead.created_at, Lead.id) < after)
+        return query.order_by(Lead.created_at.desc(), Lead.id.desc()).limit(limit + 1)
+
+    @staticmethod
+    @replica_read
+    def get_leads(db: Session, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, **filters):
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        query = LeadService.apply_filters(db.query(*Lead.__table__.columns), **filters)
+        rows = LeadService.keyset_query(query, cursor, limit).all()
+        return LeadService.listing_page(rows, limit)
+
+    @staticmethod
+    def listing_page(rows, limit: int) -> dict:
+        # List endpoints select plain columns (no ORM objects, no joins) and
+        # take the labels from the master data cache
+        page = keyset_page(rows, limit)
+        page["items"] = [master_data_cache.labelled(row, LEAD_LABEL_COLUMNS) for row in page["items"]]
+        return page
+
+    @staticmethod
+    @replica_read
+    def export_leads(db: Session, **filters):
+        # Plain columns streamed through a server-side cursor; labels come from
+        # the master data cache instead of the joined relationships
+        query = LeadService.apply_filters(db.query(*Lead.__table__.columns), **filters)
+        query = query.order_by(Lead.created_at.desc(), Lead.id.desc()).yield_per(EXPORT_BATCH_SIZE)
+        for row in query:
+            yield master_data_cache.labelled(row, LEAD_LABEL_COLUMNS)
+
+    @staticmethod
+    @replica_read
     def get_deals_leads(db: Session):
-        deal_status_names = ["Proposal", "Negotiation", "Closed Won", "Closed Lost"]
-        status_ids = db.query(MasterLeadStatus.id).filter(MasterLeadStatus.name.in_(deal_status_names)).all()
-        status_ids = [s[0] for s in status_ids]
-        return db.query(Lead).filter(Lead.status.in_(status_ids)).all()
+        status_ids = master_data_cache.ids_for_stage_group("Deal")
+        rows = db.query(*Lead.__table__.columns).filter(Lead.status.in_(status_ids)).order_by(Lead.created_at.desc())
+        return [master_data_cache.labelled(row, LEAD_LABEL_COLUMNS) for row in rows]
 
     @staticmethod
     def get_lead(db: Session, lead_id: uuid.UUID):
         return db.query(Lead).filter(Lead.id == lead_id).first()
 
+    @staticmethod
+    def _get_for_update(db: Session, lead_id: uuid.UUID):
+        # Row lock until commit: the rollup delta subtracts the contribution
+        # read here, so a concurrent writer must not change it in between
+        return db.query(Lead).filter(Lead.id == lead_id).with_for_update().first()
+
+    @staticmethod
+    def _stamp_stage_change(lead: Lead, old_status):
+        # Transition times behind the dashboard's close-time averages; leads
+        # created directly in a later stage never get them
+        if lead.status == old_status:
+            return
+        now = datetime.now(timezone.utc)
+        lead_stage = set(master_data_cache.ids_for_stage_group("Lead"))
+        closed = set(master_data_cache.ids_for_names("master_lead_status", CLOSED_LEAD_STATUSES))
+        if lead.qualified_at is None and (old_status is None or old_status in lead_stage) and lead.status not in lead_stage:
+            lead.qualified_at = now
+        if lead.status in closed:
+            if old_status not in closed:
+                lead.closed_at = now
+        else:
+            lead.closed_at = None
+
     @staticmethod
     def update_lead(db: Session, lead_id: uuid.UUID, lead_data: dict, user_id: int = None):
-        db_lead = db.query(Lead).filter(Lead.id == lead_id).first()
+        db_lead = LeadService._get_for_update(db, lead_id)
         if not db_lead:
             return None
         
         old_status = db_lead.status
+        before = LeadRollupService.contribution(db_lead)
         
         for key, value in lead_data.items():
             setattr(db_lead, key, value)
+        LeadService._stamp_stage_change(db_lead, old_status)
         
+        LeadRollupService.record_change(db, before, LeadRollupService.snapshot(db, db_lead))
         new_status = db_lead.status
-        db.commit()
-        db.refresh(db_lead)
         
         # Determine descriptive log
         description = f"Lead {db_lead.first_name} details updated."
         if old_status != new_status:
-            old_status_obj = db.query(MasterLeadStatus).filter(MasterLeadStatus.id == old_status).first()
-            new_status_obj = db.query(MasterLeadStatus).filter(MasterLeadStatus.id == new_status).first()
-            old_name = old_status_obj.name if old_status_obj else str(old_status)
-            new_name = new_status_obj.name if new_status_obj else str(new_status)
+            old_name = master_data_cache.name_for_id("master_lead_status", old_status) or str(old_status)
+            new_name = master_data_cache.name_for_id("master_lead_status", new_status) or str(new_status)
             description = f"Status changed from {old_name} to {new_name}."
         
         # Log Activity
@@ -105,101 +188,126 @@ class LeadService:
             db=db,
             action_type="UPDATE",
             entity_type="LEAD",
-            entity_id=str(db_lead.id),
+            entity_id=db_lead.id,
             description=description,
             user_id=user_id
         )
         
+        db.commit()
+        db.refresh(db_lead)
         return db_lead
 
     @staticmethod
     def delete_lead(db: Session, lead_id: uuid.UUID, user_id: int = None):
-        db_lead = db.query(Lead).filter(Lead.id == lead_id).first()
+        db_lead = LeadService._get_for_update(db, lead_id)
         if not db_lead:
             return False
         
+        LeadRollupService.record_change(db, LeadRollupService.contribution(db_lead), None)
         db.delete(db_lead)
-        db.commit()
         
         # Log Activity
         ActivityService.log_activity(
             db=db,
             action_type="DELETE",
             entity_type="LEAD",
-            entity_id=str(lead_id),
+            entity_id=lead_id,
             description=f"Lead {db_lead.first_name} deleted.",
             user_id=user_id
         )
         
+        db.commit()
         return True
 
     @staticmethod
     def update_lead_status(db: Session, lead_id: uuid.UUID, new_status: str, user_id: int = None):
         # new_status might be ID or Name. Assume ID if possible or resolve.
-        lead = db.query(Lead).filter(Lead.id == lead_id).first()
+        lead = LeadService._get_for_update(db, lead_id)
         if not lead:
             return None
             
         old_status = lead.status
         
-        # Resolve new_status to ID if it's a string name
-        # If new_status comes from frontend combobox, it might be int or str representation of int
-        final_status_id = None
-        if isinstance(new_status, int) or (isinstance(new_status, str) and new_status.isdigit()):
-             final_status_id = int(new_status)
-        else:
-             status_obj = db.query(MasterLeadStatus).filter(MasterLeadStatus.name == new_status).first()
-             if status_obj:
-                 final_status_id = status_obj.id
+        # Resolve new_status to ID; the frontend combobox sends either the ID or the name
+        final_status_id = master_data_cache.resolve_id("master_lead_status", new_status)
         
         if final_status_id is not None:
             # Get names for descriptive logging
-            old_status_obj = db.query(MasterLeadStatus).filter(MasterLeadStatus.id == old_status).first()
-            new_status_obj = db.query(MasterLeadStatus).filter(MasterLeadStatus.id == final_status_id).first()
-            old_name = old_status_obj.name if old_status_obj else str(old_status)
-            new_name = new_status_obj.name if new_status_obj else str(final_status_id)
+            old_name = master_data_cache.name_for_id("master_lead_status", old_status) or str(old_status)
+            new_name = master_data_cache.name_for_id("master_lead_status", final_status_id) or str(final_status_id)
 
+            before = LeadRollupService.contribution(lead)
             lead.status = final_status_id
-            db.commit()
+            LeadService._stamp_stage_change(lead, old_status)
+            LeadRollupService.record_change(db, before, LeadRollupService.snapshot(db, lead))
             
             # Log Activity
             ActivityService.log_activity(
                 db=db,
                 action_type="UPDATE",
                 entity_type="LEAD",
-                entity_id=str(lead.id),
+                entity_id=lead.id,
                 description=f"Status changed from {old_name} to {new_name}.",
                 user_id=user_id
             )
             
+            db.commit()
             return lead
         return None
 
     @staticmethod
     def convert_lead(db: Session, lead_id: uuid.UUID, conversion_data: dict, user_id: int = None):
-        lead = db.query(Lead).filter(Lead.id == lead_id).first()
+        lead = LeadService._get_for_update(db, lead_id)
         if not lead:
             return None
             
+        before = LeadRollupService.contribution(lead)
+
         # Update Lead Status to "Proposal" (Get ID)
-        proposal_status = db.query(MasterLeadStatus).filter(MasterLeadStatus.name == "Proposal").first()
-        if proposal_status:
-            lead.status = proposal_status.id
+        proposal_status_id = master_data_cache.id_for_name("master_lead_status", "Proposal")
+        if proposal_status_id:
+            old_status = lead.status
+            lead.status = proposal_status_id
+            LeadService._stamp_stage_change(lead, old_status)
         
         # If revenue/probability provided, update them
         if 'estimated_revenue' in conversion_data:
             lead.estimated_revenue = conversion_data['estimated_revenue']
         
-        db.commit()
-        
+        LeadRollupService.record_change(db, before, LeadRollupService.snapshot(db, lead))
+
         # Log Activity
         ActivityService.log_activity(
             db=db,
             action_type="CONVERT",
             entity_type="LEAD",
-            entity_id=str(lead.id),
+            entity_id=lead.id,
             description="Lead converted to Deal (Proposal).",
             user_id=user_id
         )
         
+        db.commit()
         return lead
+
+
+class AsyncLeadService:
+    @staticmethod
+    @replica_read
+    async def get_leads(db: AsyncSession, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, **filters):
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        stmt = LeadService.apply_filters(select(*Lead.__table__.columns), **filters)
+        result = await db.execute(LeadService.keyset_query(stmt, cursor, limit))
+        return LeadService.listing_page(result.all(), limit)
+
+    @staticmethod
+    @replica_read
+    async def get_deals_leads(db: AsyncSession):
+        status_ids = master_data_cache.ids_for_stage_group("Deal")
+        result = await db.execute(
+            select(*Lead.__table__.columns).filter(Lead.status.in_(status_ids)).order_by(Lead.created_at.desc())
+        )
+        return [master_data_cache.labelled(row, LEAD_LABEL_COLUMNS) for row in result]
+
+    @staticmethod
+    async def get_lead(db: AsyncSession, lead_id: uuid.UUID):
+        return await db.get(Lead, lead_id)
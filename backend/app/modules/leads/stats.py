@@ -0,0 +1,247 @@
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import case, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import replica_read
+from app.modules.master_data.cache import master_data_cache
+from app.modules.master_data.models import CLOSED_LEAD_STATUSES, WON_LEAD_STATUS
+from .models import Lead, LeadPipelineRollup
+from .rollups import NO_VALUE
+from .services import LeadService
+
+SECONDS_PER_DAY = 86400
+DEFAULT_TREND_DAYS = 7
+MAX_TREND_DAYS = 90
+
+_start = func.extract("epoch", Lead.created_at)
+_lead_end = func.extract("epoch", Lead.qualified_at)
+_deal_end = func.extract("epoch", func.coalesce(Lead.closed_at, Lead.closing_date))
+# Close durations in seconds; NULL (ignored by SUM/COUNT) when the end is
+# missing or precedes the start
+_lead_seconds = case((_lead_end >= _start, _lead_end - _start))
+_deal_seconds = case((_deal_end >= _start, _deal_end - _start))
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Naive filter values are taken as UTC, like the rollup days
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _day_aligned(value: Optional[datetime]) -> bool:
+    return value is None or _as_utc(value).time() == time.min
+
+
+def _dimension(column):
+    return func.nullif(column, NO_VALUE, type_=column.type)
+
+
+class LeadStatsService:
+    """
+    Dashboard KPIs computed with GROUP BY in the database; only the numbers
+    leave it. Reads come from lead_pipeline_rollups (O(buckets)) unless a
+    created_* filter falls inside a day, which needs the leads table itself.
+    """
+
+    @staticmethod
+    def rollup_query(
+        owner_id: Optional[uuid.UUID] = None,
+        branch_id: Optional[uuid.UUID] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ):
+        rollup = LeadPipelineRollup
+        stmt = select(
+            _dimension(rollup.status).label("status"),
+            _dimension(rollup.source).label("source"),
+            func.sum(rollup.lead_count).label("count"),
+            func.sum(rollup.revenue_sum).label("revenue"),
+            func.sum(rollup.lead_close_seconds).label("lead_seconds"),
+            func.sum(rollup.lead_close_count).label("lead_closed"),
+            func.sum(rollup.deal_close_seconds).label("deal_seconds"),
+            func.sum(rollup.deal_close_count).label("deal_closed"),
+        ).group_by(rollup.status, rollup.source)
+        return LeadStatsService._filter_rollups(stmt, owner_id, branch_id, created_from, created_to)
+
+    @staticmethod
+    def rollup_trend_query(since: datetime, owner_id=None, branch_id=None, created_from=None, created_to=None):
+        rollup = LeadPipelineRollup
+        stmt = (
+            select(
+                rollup.day.label("day"),
+                _dimension(rollup.status).label("status"),
+                func.sum(rollup.lead_count).label("count"),
+            )
+            .where(rollup.day >= since.date())
+            .group_by(rollup.day, rollup.status)
+        )
+        return LeadStatsService._filter_rollups(stmt, owner_id, branch_id, created_from, created_to)
+
+    @staticmethod
+    def _filter_rollups(stmt, owner_id, branch_id, created_from, created_to):
+        rollup = LeadPipelineRollup
+        if owner_id:
+            stmt = stmt.where(rollup.owner_id == owner_id)
+        if branch_id:
+            stmt = stmt.where(rollup.branch_id == branch_id)
+        if created_from:
+            stmt = stmt.where(rollup.day >= _as_utc(created_from).date())
+        if created_to:
+            stmt = stmt.where(rollup.day < _as_utc(created_to).date())
+        return stmt
+
+    @staticmethod
+    def aggregate_query(**filters):
+        stmt = select(
+            Lead.status,
+            Lead.source,
+            func.count().label("count"),
+            func.coalesce(func.sum(Lead.estimated_revenue), 0).label("revenue"),
+            func.coalesce(func.sum(_lead_seconds), 0).label("lead_seconds"),
+            func.count(_lead_seconds).label("lead_closed"),
+            func.coalesce(func.sum(_deal_seconds), 0).label("deal_seconds"),
+            func.count(_deal_seconds).label("deal_closed"),
+        ).group_by(Lead.status, Lead.source)
+        return LeadService.apply_filters(stmt, **filters)
+
+    @staticmethod
+    def trend_query(since: datetime, **filters):
+        # UTC day, like the rollups and the created_* filters. A literal rather
+        # than a bound parameter, so asyncpg sees the same expression in
+        # SELECT and GROUP BY
+        day = func.date(func.timezone(literal_column("'UTC'"), Lead.created_at))
+        stmt = (
+            select(day.label("day"), Lead.status, func.count().label("count"))
+            .where(Lead.created_at >= since)
+            .group_by(day, Lead.status)
+        )
+        return LeadService.apply_filters(stmt, **filters)
+
+    @staticmethod
+    def summarize(rows, trend_rows, trend_start: date, trend_days: int) -> dict:
+        statuses = master_data_cache.all("master_lead_status")
+        group_of = {status.id: status.stage_group for status in statuses}
+        won_id = master_data_cache.id_for_name("master_lead_status", WON_LEAD_STATUS)
+        closed_ids = set(master_data_cache.ids_for_names("master_lead_status", CLOSED_LEAD_STATUSES))
+
+        by_status = {}
+        by_source = {}
+        groups = {"Lead": 0, "Opportunity": 0, "Deal": 0}
+        total = ongoing = 0
+        lead_seconds = lead_closed = 0
+        won_seconds = won_closed = 0
+
+        for row in rows:
+            total += row.count
+            status = by_status.setdefault(row.status, {"count": 0, "revenue": 0.0})
+            status["count"] += row.count
+            status["revenue"] += float(row.revenue)
+            by_source[row.source] = by_source.get(row.source, 0) + row.count
+
+            group = group_of.get(row.status)
+            if group in groups:
+                groups[group] += row.count
+            if group == "Deal" and row.status not in closed_ids:
+                ongoing += row.count
+            # Lead close time: leads that made it past the Lead stage
+            if group in ("Opportunity", "Deal"):
+                lead_seconds += float(row.lead_seconds)
+                lead_closed += row.lead_closed
+            if row.status == won_id:
+                won_seconds += float(row.deal_seconds)
+                won_closed += row.deal_closed
+
+        won = (won_id and by_status.get(won_id)) or {"count": 0, "revenue": 0.0}
+
+        status_counts = [
+            {
+                "id": status.id,
+                "name": status.name,
+                "stage_group": status.stage_group,
+                "color": status.color,
+                "count": by_status.get(status.id, {}).get("count", 0),
+                "revenue": by_status.get(status.id, {}).get("revenue", 0.0),
+            }
+            for status in statuses
+        ]
+        if None in by_status:
+            status_counts.append({"id": None, "name": "Unknown", "count": by_status[None]["count"], "revenue": by_status[None]["revenue"]})
+
+        source_counts = sorted(
+            (
+                {
+                    "id": source_id,
+                    "name": master_data_cache.name_for_id("master_sources", source_id) or "Unknown",
+                    "count": count,
+                }
+                for source_id, count in by_source.items()
+            ),
+            key=lambda item: (-item["count"], item["name"]),
+        )
+
+        trend = {
+            trend_start + timedelta(days=offset): {"leads": 0, "deals": 0, "won": 0}
+            for offset in range(trend_days)
+        }
+        for row in trend_rows:
+            day = row.day if isinstance(row.day, date) else date.fromisoformat(str(row.day))
+            point = trend.get(day)
+            if point is None:
+                continue
+            group = group_of.get(row.status)
+            if group == "Lead":
+                point["leads"] += row.count
+            elif group == "Deal":
+                point["deals"] += row.count
+            if row.status == won_id:
+                point["won"] += row.count
+
+        return {
+            "total": total,
+            "total_leads": groups["Lead"],
+            "total_opportunities": groups["Opportunity"],
+            "ongoing_deals": ongoing,
+            "won_deals": won["count"],
+            "won_revenue": won["revenue"],
+            "avg_deal_value": won["revenue"] / won["count"] if won["count"] else 0.0,
+            "avg_lead_close_days": lead_seconds / lead_closed / SECONDS_PER_DAY if lead_closed else None,
+            "avg_deal_close_days": won_seconds / won_closed / SECONDS_PER_DAY if won_closed else None,
+            "by_status": status_counts,
+            "by_source": source_counts,
+            "trend": [{"date": day, **point} for day, point in trend.items()],
+        }
+
+    @staticmethod
+    @replica_read
+    async def get_stats(
+        db: AsyncSession,
+        owner_id: Optional[uuid.UUID] = None,
+        branch_id: Optional[uuid.UUID] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        trend_days: int = DEFAULT_TREND_DAYS,
+    ) -> dict:
+        filters = {
+            "owner_id": owner_id,
+            "branch_id": branch_id,
+            "created_from": created_from,
+            "created_to": created_to,
+        }
+        trend_days = max(1, min(trend_days, MAX_TREND_DAYS))
+        trend_start = datetime.now(timezone.utc).date() - timedelta(days=trend_days - 1)
+        since = datetime.combine(trend_start, datetime.min.time(), tzinfo=timezone.utc)
+
+        if _day_aligned(created_from) and _day_aligned(created_to):
+            aggregate = LeadStatsService.rollup_query(**filters)
+            trend_query = LeadStatsService.rollup_trend_query(since, **filters)
+        else:
+            aggregate = LeadStatsService.aggregate_query(**filters)
+            trend_query = LeadStatsService.trend_query(since, **filters)
+
+        rows = (await db.execute(aggregate)).all()
+        trend_rows = (await db.execute(trend_query)).all()
+        return LeadStatsService.summarize(rows, trend_rows, trend_start, trend_days)
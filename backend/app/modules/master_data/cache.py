@@ -0,0 +1,182 @@
+import bisect
+import hashlib
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from app.core import database
+from app.core.cache import version_tracker
+from app.core.config import settings
+from .models import MASTER_TABLES
+from .schemas import MasterDataResponse
+
+
+class MasterTableSnapshot:
+    def __init__(self, rows: List[MasterDataResponse], version: int):
+        self.rows = rows
+        self.by_id: Dict[uuid.UUID, MasterDataResponse] = {row.id: row for row in rows}
+        self.by_name: Dict[str, MasterDataResponse] = {row.name: row for row in rows}
+        self.by_stage_group: Dict[str, List[uuid.UUID]] = {}
+        for row in rows:
+            if row.stage_group:
+                self.by_stage_group.setdefault(row.stage_group, []).append(row.id)
+        self.version = version
+        self.loaded_at = time.monotonic()
+        # Identifies the exact content, for ETags
+        self.fingerprint = hashlib.sha1(
+            b"\n".join(row.model_dump_json().encode() for row in rows)
+        ).hexdigest()
+
+        # Type-ahead indexes: sorted lowercase names for prefix lookups and
+        # trigram postings to narrow substring matches
+        self._lower = [row.name.lower() for row in rows]
+        self._sorted = sorted((name, position) for position, name in enumerate(self._lower))
+        self._trigrams: Dict[str, Set[int]] = {}
+        for position, name in enumerate(self._lower):
+            for trigram in _trigrams(name):
+                self._trigrams.setdefault(trigram, set()).add(position)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[MasterDataResponse]:
+        """Rows matching `query`, exact matches first, then prefix, then substring."""
+        needle = query.strip().lower()
+        if not needle:
+            return self.rows[:limit] if limit else self.rows
+
+        exact, prefix = [], []
+        start = bisect.bisect_left(self._sorted, (needle,))
+        for name, position in self._sorted[start:]:
+            if not name.startswith(needle):
+                break
+            (exact if name == needle else prefix).append(position)
+
+        seen = set(exact) | set(prefix)
+        trigrams = _trigrams(needle)
+        if trigrams:
+            candidates = set.intersection(*(self._trigrams.get(t, set()) for t in trigrams))
+        else:
+            candidates = range(len(self.rows))
+        substring = sorted(
+            position for position in candidates
+            if position not in seen and needle in self._lower[position]
+        )
+
+        positions = exact + prefix + substring
+        if limit:
+            positions = positions[:limit]
+        return [self.rows[position] for position in positions]
+
+
+def _trigrams(value: str) -> Set[str]:
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class MasterDataCache:
+    """
+    In-memory copy of the master_* tables.
+
+    Each table is reloaded by the cache refresher thread when its row in
+    cache_versions changes (bumped by MasterDataService.create, polled by every
+    worker) or when the TTL expires. Readers only ever see the current
+    snapshot; the writing worker reloads its own copy in invalidate().
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._tables: Dict[str, MasterTableSnapshot] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        for table in MASTER_TABLES:
+            self._reload(table, version_tracker.get(table))
+
+    def invalidate(self, table: str) -> None:
+        # Called from sync handlers after commit, i.e. on a worker thread
+        version_tracker.refresh()
+        self._reload(table, version_tracker.get(table))
+
+    def refresh_stale(self) -> None:
+        for table in MASTER_TABLES:
+            version = version_tracker.get(table)
+            snapshot = self._tables.get(table)
+            if (
+                snapshot is None
+                or snapshot.version != version
+                or time.monotonic() - snapshot.loaded_at >= self.ttl
+            ):
+                self._reload(table, version)
+
+    def _snapshot(self, table: str) -> MasterTableSnapshot:
+        snapshot = self._tables.get(table)
+        if snapshot is None:
+            # Only before load() has succeeded; afterwards reloads happen off
+            # the request path
+            snapshot = self._reload(table, version_tracker.get(table))
+        return snapshot
+
+    def _reload(self, table: str, version: int) -> MasterTableSnapshot:
+        model = MASTER_TABLES[table]
+        with self._lock:
+            db = database.SessionLocal()
+            try:
+                rows = db.query(model).order_by(model.name).all()
+                snapshot = MasterTableSnapshot(
+                    [MasterDataResponse.model_validate(row) for row in rows], version
+                )
+            finally:
+                db.close()
+            self._tables[table] = snapshot
+        return snapshot
+
+    def all(self, table: str) -> List[MasterDataResponse]:
+        return self._snapshot(table).rows
+
+    def snapshot(self, table: str) -> MasterTableSnapshot:
+        return self._snapshot(table)
+
+    def get(self, table: str, id: Optional[uuid.UUID]) -> Optional[MasterDataResponse]:
+        if id is None:
+            return None
+        return self._snapshot(table).by_id.get(id)
+
+    def get_by_name(self, table: str, name: Optional[str]) -> Optional[MasterDataResponse]:
+        if name is None:
+            return None
+        return self._snapshot(table).by_name.get(name)
+
+    def name_for_id(self, table: str, id: Optional[uuid.UUID]) -> Optional[str]:
+        row = self.get(table, id)
+        return row.name if row else None
+
+    def id_for_name(self, table: str, name: Optional[str]) -> Optional[uuid.UUID]:
+        row = self.get_by_name(table, name)
+        return row.id if row else None
+
+    def ids_for_names(self, table: str, names: Iterable[str]) -> List[uuid.UUID]:
+        by_name = self._snapshot(table).by_name
+        return [by_name[name].id for name in names if name in by_name]
+
+    def ids_for_stage_group(self, stage_group: str) -> List[uuid.UUID]:
+        return self._snapshot("master_lead_status").by_stage_group.get(stage_group, [])
+
+    def labelled(self, row, label_columns: Dict[str, str]) -> dict:
+        # Columns-only row -> dict with a "<column>_label" for each master column
+        data = dict(row._mapping)
+        for column, table in label_columns.items():
+            data[f"{column}_label"] = self.name_for_id(table, data[column])
+        return data
+
+    def resolve_id(self, table: str, value: Union[uuid.UUID, str, None]) -> Optional[uuid.UUID]:
+        # Accepts a UUID, a UUID string or a display name
+        if value is None or value == "":
+            return None
+        if isinstance(value, uuid.UUID):
+            return value if self.get(table, value) else None
+        try:
+            return self.resolve_id(table, uuid.UUID(str(value)))
+        except ValueError:
+            return self.id_for_name(table, value)
+
+
+master_data_cache = MasterDataCache(settings.MASTER_DATA_CACHE_TTL_SECONDS)
+version_tracker.on_refresh(master_data_cache.refresh_stale)
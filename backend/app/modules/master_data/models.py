@@ -32,6 +32,7 @@ class MasterLeadStatus(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, unique=True, index=True, nullable=False)
     color = Column(String, nullable=True)
+    stage_group = Column(String, nullable=True, index=True) # Lead, Opportunity, Deal
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class MasterTaskStatus(Base):
@@ -48,3 +49,31 @@ class MasterTaskPriority(Base):
     name = Column(String, unique=True, index=True, nullable=False)
     color = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+# Pipeline buckets used by the Leads / Opportunities / Deals boards
+LEAD_STAGE_GROUPS = ("Lead", "Opportunity", "Deal")
+
+DEFAULT_LEAD_STAGE_GROUPS = {
+    "New": "Lead",
+    "Attempted to Contact": "Lead",
+    "Contacted": "Lead",
+    "Unqualified": "Lead",
+    "Qualified": "Opportunity",
+    "Proposal": "Deal",
+    "Negotiation": "Deal",
+    "Closed Won": "Deal",
+    "Closed Lost": "Deal",
+}
+
+WON_LEAD_STATUS = "Closed Won"
+CLOSED_LEAD_STATUSES = ("Closed Won", "Closed Lost")
+
+MASTER_TABLES = {
+    "master_industries": MasterIndustry,
+    "master_sources": MasterSource,
+    "master_salutations": MasterSalutation,
+    "master_employee_counts": MasterEmployeeCount,
+    "master_lead_status": MasterLeadStatus,
+    "master_task_status": MasterTaskStatus,
+    "master_task_priority": MasterTaskPriority,
+}
@@ -1,18 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
+from app.core.http_cache import etag_matches, make_etag, not_modified, set_validators
+from .cache import master_data_cache
 from .schemas import MasterDataCreate, MasterDataResponse
 from .services import MasterDataService
 
 router = APIRouter()
 
+MAX_TYPEAHEAD_LIMIT = 100
+
 @router.get("/{table}", response_model=List[MasterDataResponse])
-def read_master_data(table: str, query: Optional[str] = None, db: Session = Depends(get_db)):
-    data = MasterDataService.get_all(db, table, query)
-    if data is None:
+def read_master_data(
+    table: str,
+    request: Request,
+    response: Response,
+    query: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_TYPEAHEAD_LIMIT),
+):
+    if MasterDataService.get_model_by_table_name(table) is None:
         raise HTTPException(status_code=404, detail="Table not found")
-    return data
+
+    snapshot = master_data_cache.snapshot(table)
+    etag = make_etag(table, snapshot.version, snapshot.fingerprint, (query or "").strip().lower(), limit or "")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_validators(response, etag)
+    # Body from the same snapshot as the ETag, even if a reload lands in
+    # between; exact > prefix > substring matches
+    return snapshot.search(query or "", limit)
 
 @router.post("/{table}", response_model=MasterDataResponse)
 def create_master_data(table: str, item: MasterDataCreate, db: Session = Depends(get_db)):
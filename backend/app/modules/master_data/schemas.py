@@ -1,14 +1,20 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 import uuid
+from .models import LEAD_STAGE_GROUPS
+
+# A status outside these groups would drop out of every board and the stats
+StageGroup = Literal[LEAD_STAGE_GROUPS]
 
 class MasterDataCreate(BaseModel):
     name: str
+    stage_group: Optional[StageGroup] = None
 
 class MasterDataResponse(BaseModel):
     id: uuid.UUID
     name: str
     icon: Optional[str] = None
     color: Optional[str] = None
+    stage_group: Optional[str] = None
     class Config:
         from_attributes = True
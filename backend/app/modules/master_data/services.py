@@ -1,45 +1,26 @@
 from sqlalchemy.orm import Session
-from .models import MasterIndustry, MasterSource, MasterSalutation, MasterEmployeeCount, MasterLeadStatus, MasterTaskStatus, MasterTaskPriority
+from app.core.cache import bump_version
+from .models import MASTER_TABLES
 from .schemas import MasterDataCreate
+from .cache import master_data_cache
 
 class MasterDataService:
     @staticmethod
     def get_model_by_table_name(table_name: str):
-        if table_name == 'master_industries':
-            return MasterIndustry
-        if table_name == 'master_sources':
-            return MasterSource
-        if table_name == 'master_salutations':
-            return MasterSalutation
-        if table_name == 'master_employee_counts':
-            return MasterEmployeeCount
-        if table_name == 'master_lead_status':
-            return MasterLeadStatus
-        if table_name == 'master_task_status':
-            return MasterTaskStatus
-        if table_name == 'master_task_priority':
-            return MasterTaskPriority
-        return None
-
-    @staticmethod
-    def get_all(db: Session, table_name: str, query: str = None):
-        model = MasterDataService.get_model_by_table_name(table_name)
-        if not model:
-            return None
-        
-        q = db.query(model)
-        if query:
-            q = q.filter(model.name.ilike(f"%{query}%"))
-        return q.all()
+        return MASTER_TABLES.get(table_name)
 
     @staticmethod
     def create(db: Session, table_name: str, item: MasterDataCreate):
         model = MasterDataService.get_model_by_table_name(table_name)
         if not model:
             return None
-        
+
         db_item = model(name=item.name)
+        if item.stage_group and hasattr(model, "stage_group"):
+            db_item.stage_group = item.stage_group
         db.add(db_item)
+        bump_version(db, table_name)
         db.commit()
         db.refresh(db_item)
+        master_data_cache.invalidate(table_name)
         return db_item
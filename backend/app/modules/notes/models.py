@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, UUID, Text
+from sqlalchemy import Column, String, DateTime, UUID, Text, Index
 from sqlalchemy.sql import func
 import uuid
 from app.core.database import Base
@@ -17,3 +17,6 @@ class Note(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+# Notes of one record, newest first
+Index("ix_notes_entity_created_at", Note.entity_type, Note.entity_id, Note.created_at.desc())
@@ -3,6 +3,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
 from app.core.database import Base
+from app.modules.master_data.cache import master_data_cache
 
 class Organization(Base):
     __tablename__ = "organizations"
@@ -22,13 +23,13 @@ class Organization(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    industry_rel = relationship("MasterIndustry", lazy="joined")
-    no_employees_rel = relationship("MasterEmployeeCount", lazy="joined")
+    industry_rel = relationship("MasterIndustry", lazy="raise")
+    no_employees_rel = relationship("MasterEmployeeCount", lazy="raise")
 
     @property
     def industry_label(self):
-        return self.industry_rel.name if self.industry_rel else None
+        return master_data_cache.name_for_id("master_industries", self.industry)
 
     @property
     def no_employees_label(self):
-        return self.no_employees_rel.name if self.no_employees_rel else None
+        return master_data_cache.name_for_id("master_employee_counts", self.no_employees)
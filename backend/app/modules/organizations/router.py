@@ -1,24 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_async_db
+from app.core.export import export_response
+from app.core.serialization import fast_json_response
+from pydantic import TypeAdapter
 from . import schemas, services
 import uuid
 
 router = APIRouter()
 
+ORGANIZATION_LIST = TypeAdapter(List[schemas.OrganizationResponse])
+
 @router.post("/", response_model=schemas.OrganizationResponse, status_code=201)
 def create_organization(org: schemas.OrganizationCreate, db: Session = Depends(get_db)):
     # Check uniqueness if needed, skipping for now as per plan
     return services.OrganizationService.create_organization(db=db, org=org)
 
 @router.get("/", response_model=List[schemas.OrganizationResponse])
-def read_organizations(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return services.OrganizationService.get_organizations(db, skip=skip, limit=limit)
+async def read_organizations(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    organizations = await services.AsyncOrganizationService.get_organizations(db, skip=skip, limit=limit)
+    return fast_json_response(ORGANIZATION_LIST, organizations)
+
+@router.get("/export")
+def export_organizations(format: str = Query("csv", pattern="^(csv|ndjson)$")):
+    return export_response(
+        services.OrganizationService.export_organizations,
+        list(schemas.OrganizationResponse.model_fields),
+        format,
+        "organizations",
+    )
 
 @router.get("/{org_id}", response_model=schemas.OrganizationResponse)
-def read_organization(org_id: str, db: Session = Depends(get_db)):
-    org = services.OrganizationService.get_organization(db, uuid.UUID(org_id))
+async def read_organization(org_id: str, db: AsyncSession = Depends(get_async_db)):
+    org = await services.AsyncOrganizationService.get_organization(db, uuid.UUID(org_id))
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
     return org
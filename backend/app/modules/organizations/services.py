@@ -1,8 +1,18 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from .models import Organization
 from . import schemas
 import uuid
-from typing import Optional
+from typing import Iterator, Optional
+from app.core.export import EXPORT_BATCH_SIZE
+from app.core.database import replica_read
+from app.modules.master_data.cache import master_data_cache
+
+ORGANIZATION_LABEL_COLUMNS = {
+    "industry": "master_industries",
+    "no_employees": "master_employee_counts",
+}
 
 class OrganizationService:
     @staticmethod
@@ -18,8 +28,18 @@ class OrganizationService:
         return db.query(Organization).filter(Organization.name == name).first()
     
     @staticmethod
+    @replica_read
     def get_organizations(db: Session, skip: int = 0, limit: int = 100):
-        return db.query(Organization).offset(skip).limit(limit).all()
+        rows = db.query(*Organization.__table__.columns).offset(skip).limit(limit).all()
+        return [master_data_cache.labelled(row, ORGANIZATION_LABEL_COLUMNS) for row in rows]
+
+    @staticmethod
+    @replica_read
+    def export_organizations(db: Session) -> Iterator[dict]:
+        query = db.query(*Organization.__table__.columns)
+        query = query.order_by(Organization.created_at.desc(), Organization.id.desc()).yield_per(EXPORT_BATCH_SIZE)
+        for row in query:
+            yield master_data_cache.labelled(row, ORGANIZATION_LABEL_COLUMNS)
 
     @staticmethod
     def get_organization(db: Session, org_id: uuid.UUID):
@@ -48,3 +68,15 @@ class OrganizationService:
         db.delete(db_org)
         db.commit()
         return True
+
+
+class AsyncOrganizationService:
+    @staticmethod
+    @replica_read
+    async def get_organizations(db: AsyncSession, skip: int = 0, limit: int = 100):
+        result = await db.execute(select(*Organization.__table__.columns).offset(skip).limit(limit))
+        return [master_data_cache.labelled(row, ORGANIZATION_LABEL_COLUMNS) for row in result]
+
+    @staticmethod
+    async def get_organization(db: AsyncSession, org_id: uuid.UUID):
+        return await db.get(Organization, org_id)
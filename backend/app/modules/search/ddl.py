@@ -0,0 +1,25 @@
+# Generated columns behind /search. Postgres recomputes them on every
+# INSERT/UPDATE, so the index never lags the row.
+
+def _concat(*columns: str) -> str:
+    return " || ' ' || ".join(f"coalesce({c}, '')" for c in columns)
+
+SEARCHABLE_COLUMNS = {
+    "leads": ("first_name", "last_name", "email", "mobile_no", "organization", "website"),
+    "contacts": ("first_name", "last_name", "email", "mobile_no", "organization"),
+    "organizations": ("name", "website"),
+}
+
+SEARCH_COLUMNS_DDL = ["CREATE EXTENSION IF NOT EXISTS pg_trgm;"]
+SEARCH_INDEXES = []
+for _table, _columns in SEARCHABLE_COLUMNS.items():
+    SEARCH_COLUMNS_DDL += [
+        f"ALTER TABLE {_table} ADD COLUMN IF NOT EXISTS search_document tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, {_concat(*_columns)})) STORED;",
+        f"ALTER TABLE {_table} ADD COLUMN IF NOT EXISTS search_text text "
+        f"GENERATED ALWAYS AS (lower({_concat(*_columns)})) STORED;",
+    ]
+    SEARCH_INDEXES += [
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{_table}_search_document ON {_table} USING gin (search_document);",
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{_table}_search_text_trgm ON {_table} USING gin (search_text gin_trgm_ops);",
+    ]
@@ -0,0 +1,19 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from .schemas import SearchResult
+from .services import AsyncSearchService, SEARCH_TYPES, DEFAULT_LIMIT, MAX_LIMIT
+
+router = APIRouter()
+
+@router.get("", response_model=SearchResult)
+async def search(
+    q: str = Query(..., max_length=200),
+    types: Optional[List[str]] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await AsyncSearchService.search(db, q, types or SEARCH_TYPES, limit)
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, UUID4
+from typing import List, Optional
+
+class SearchHit(BaseModel):
+    type: str  # lead, contact, organization
+    id: UUID4
+    title: str
+    subtitle: Optional[str] = None
+    score: float
+
+class SearchResult(BaseModel):
+    query: str
+    items: List[SearchHit]
+    timed_out: bool = False
@@ -0,0 +1,108 @@
+import re
+from typing import Iterable
+
+from sqlalchemy import Float, Text, column, func, literal, literal_column, select, table, text, union_all
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+SEARCH_TYPES = ("lead", "contact", "organization")
+MIN_QUERY_LENGTH = 2
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+QUERY_CANCELED = "57014"
+
+# search_document / search_text are generated columns kept current by
+# Postgres on every write (see scripts/migrate_004_search_index.py); they are
+# not mapped on the models so regular queries never load them.
+def _searchable(name: str, *columns: str):
+    return table(
+        name,
+        column("id"),
+        column("search_document", TSVECTOR),
+        column("search_text", Text),
+        *[column(c, Text) for c in columns],
+    )
+
+leads = _searchable("leads", "first_name", "last_name", "email", "organization", "mobile_no")
+contacts = _searchable("contacts", "first_name", "last_name", "email", "organization", "mobile_no")
+organizations = _searchable("organizations", "name", "website")
+
+
+def _person_title(t):
+    return func.trim(t.c.first_name + literal(" ") + func.coalesce(t.c.last_name, ""))
+
+
+SOURCES = {
+    "lead": (leads, _person_title, lambda t: func.coalesce(t.c.email, t.c.organization, t.c.mobile_no)),
+    "contact": (contacts, _person_title, lambda t: func.coalesce(t.c.email, t.c.organization, t.c.mobile_no)),
+    "organization": (organizations, lambda t: t.c.name, lambda t: t.c.website),
+}
+
+
+def prefix_tsquery(query: str) -> str:
+    # Every word must match, each as a prefix: "acme ind" -> "acme:* & ind:*"
+    words = re.findall(r"\w+", query.lower())
+    return " & ".join(f"{word}:*" for word in words)
+
+
+class SearchService:
+    @staticmethod
+    def search_query(query: str, types: Iterable[str], limit: int):
+        """
+        Ranked hits: full-text prefix matches (GIN on search_document) or
+        fuzzy matches (pg_trgm GIN on search_text), scored by ts_rank plus
+        word similarity. Each branch is limited before the merge.
+        """
+        needle = query.lower()
+        tsquery = prefix_tsquery(query)
+        branches = []
+        for kind in types:
+            source, title, subtitle = SOURCES[kind]
+            document_match = literal(False)
+            rank = literal(0.0, Float)
+            if tsquery:
+                ts = func.to_tsquery(literal_column("'simple'"), tsquery)
+                document_match = source.c.search_document.op("@@")(ts)
+                rank = func.ts_rank(source.c.search_document, ts)
+            fuzzy_match = literal(needle).op("<%")(source.c.search_text)
+            score = (rank + func.word_similarity(needle, source.c.search_text)).label("score")
+            branch = (
+                select(
+                    literal_column(f"'{kind}'", Text).label("type"),
+                    source.c.id.label("id"),
+                    title(source).label("title"),
+                    subtitle(source).label("subtitle"),
+                    score,
+                )
+                .where(document_match | fuzzy_match)
+                .order_by(score.desc())
+                .limit(limit)
+            )
+            branches.append(select(branch.subquery()))
+
+        merged = union_all(*branches).subquery()
+        return select(merged).order_by(merged.c.score.desc(), merged.c.title).limit(limit)
+
+
+class AsyncSearchService:
+    @staticmethod
+    async def search(db: AsyncSession, query: str, types: Iterable[str] = SEARCH_TYPES, limit: int = DEFAULT_LIMIT):
+        query = query.strip()
+        types = [kind for kind in types if kind in SOURCES]
+        if len(query) < MIN_QUERY_LENGTH or not types:
+            return {"query": query, "items": [], "timed_out": False}
+        limit = max(1, min(limit, MAX_LIMIT))
+
+        # Hard budget: Postgres cancels the statement past SEARCH_TIMEOUT_MS
+        await db.execute(text(f"SET LOCAL statement_timeout = {int(settings.SEARCH_TIMEOUT_MS)}"))
+        try:
+            result = await db.execute(SearchService.search_query(query, types, limit))
+        except DBAPIError as e:
+            if getattr(e.orig, "pgcode", None) != QUERY_CANCELED:
+                raise
+            await db.rollback()
+            return {"query": query, "items": [], "timed_out": True}
+        return {"query": query, "items": [dict(row._mapping) for row in result], "timed_out": False}
@@ -0,0 +1,73 @@
+import hashlib
+import threading
+from typing import NamedTuple, Optional
+
+from app.core import database
+from app.core.cache import version_tracker
+from .models import Settings
+from .schemas import SettingsResponse
+
+SETTINGS_CACHE = "settings"
+
+
+class SettingsSnapshot(NamedTuple):
+    version: int
+    settings: SettingsResponse
+    # Identifies the exact content, for ETags; the version alone restarts
+    # after reset_db or a restore
+    fingerprint: str
+
+
+class SettingsCache:
+    """
+    Process-wide copy of the singleton settings row.
+
+    Reloaded by the cache refresher thread when the "settings" row in
+    cache_versions changes; update_settings bumps it in the same transaction
+    and reloads the writing worker's copy straight away. Until the row exists
+    the schema defaults are served.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[SettingsSnapshot] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        self._reload(version_tracker.get(SETTINGS_CACHE))
+
+    def invalidate(self) -> None:
+        # Called from sync handlers after commit, i.e. on a worker thread
+        version_tracker.refresh()
+        self._reload(version_tracker.get(SETTINGS_CACHE))
+
+    def refresh_stale(self) -> None:
+        version = version_tracker.get(SETTINGS_CACHE)
+        if self._snapshot is None or self._snapshot.version != version:
+            self._reload(version)
+
+    def snapshot(self) -> SettingsSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            # Only before load() has succeeded
+            snapshot = self._reload(version_tracker.get(SETTINGS_CACHE))
+        return snapshot
+
+    def get(self) -> SettingsResponse:
+        return self.snapshot().settings
+
+    def _reload(self, version: int) -> SettingsSnapshot:
+        with self._lock:
+            db = database.SessionLocal()
+            try:
+                row = db.query(Settings).order_by(Settings.id).first()
+                current = SettingsResponse.model_validate(row) if row else SettingsResponse(id=1)
+            finally:
+                db.close()
+            fingerprint = hashlib.sha1(current.model_dump_json().encode()).hexdigest()
+            snapshot = SettingsSnapshot(version, current, fingerprint)
+            self._snapshot = snapshot
+        return snapshot
+
+
+settings_cache = SettingsCache()
+version_tracker.on_refresh(settings_cache.refresh_stale)
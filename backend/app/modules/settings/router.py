@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from app.core.database import get_db
+from app.core.http_cache import etag_matches, make_etag, not_modified, set_validators
 from sqlalchemy.orm import Session
 from app.modules.settings.schemas import SettingsUpdate, SettingsResponse
+from app.modules.settings.cache import settings_cache, SETTINGS_CACHE
 from app.modules.settings.services import SettingsService
 
 router = APIRouter()
 
 @router.get("", response_model=SettingsResponse)
-def get_settings(db: Session = Depends(get_db)):
-    settings = SettingsService.get_settings(db)
-    return settings
+def get_settings(request: Request, response: Response):
+    snapshot = settings_cache.snapshot()
+    etag = make_etag(SETTINGS_CACHE, snapshot.version, snapshot.fingerprint)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_validators(response, etag)
+    return snapshot.settings
 
 @router.put("", response_model=SettingsResponse)
 def update_settings(settings: SettingsUpdate, db: Session = Depends(get_db)):
@@ -1,22 +1,17 @@
 from sqlalchemy.orm import Session
+from app.core.cache import bump_version
+from .cache import settings_cache, SETTINGS_CACHE
 from .models import Settings
 from .schemas import SettingsUpdate
 
 class SettingsService:
     @staticmethod
-    def get_settings(db: Session):
-        settings = db.query(Settings).first()
+    def update_settings(db: Session, settings_update: SettingsUpdate):
+        settings = db.query(Settings).order_by(Settings.id).first()
         if not settings:
-            # Create default settings if not exists
+            # First write creates the singleton row
             settings = Settings(id=1, app_name="SantaiWorks CRM", company_name="SantaiWorks", currency="IDR")
             db.add(settings)
-            db.commit()
-            db.refresh(settings)
-        return settings
-
-    @staticmethod
-    def update_settings(db: Session, settings_update: SettingsUpdate):
-        settings = SettingsService.get_settings(db)
         
         if settings_update.app_name is not None:
             settings.app_name = settings_update.app_name
@@ -25,6 +20,8 @@ class SettingsService:
         if settings_update.currency is not None:
             settings.currency = settings_update.currency.value
             
+        bump_version(db, SETTINGS_CACHE)
         db.commit()
         db.refresh(settings)
+        settings_cache.invalidate()
         return settings
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, UUID, Text, Integer, ForeignKey
+from sqlalchemy import Column, String, DateTime, UUID, Text, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -16,8 +16,10 @@ class Task(Base):
     status_id = Column(UUID(as_uuid=True), ForeignKey("master_task_status.id"), nullable=True)
     priority_id = Column(UUID(as_uuid=True), ForeignKey("master_task_priority.id"), nullable=True)
     
-    status_rel = relationship("MasterTaskStatus")
-    priority_rel = relationship("MasterTaskPriority")
+    # Loaded with joinedload for single tasks; lists resolve them from the
+    # master data cache instead (see tasks.services)
+    status_rel = relationship("MasterTaskStatus", lazy="raise")
+    priority_rel = relationship("MasterTaskPriority", lazy="raise")
     
     entity_type = Column(String, nullable=True) # e.g., 'LEAD', 'DEAL'
     entity_id = Column(UUID(as_uuid=True), nullable=True)
@@ -32,3 +34,6 @@ class Task(Base):
     @property
     def priority(self):
         return self.priority_rel.name if self.priority_rel else None
+
+# Tasks linked to a lead, deal, ...
+Index("ix_tasks_entity_created_at", Task.entity_type, Task.entity_id, Task.created_at.desc())
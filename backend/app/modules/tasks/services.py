@@ -1,8 +1,26 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from .models import Task
 from . import schemas
 import uuid
 from typing import Optional
+from app.core.database import replica_read
+from app.modules.master_data.cache import master_data_cache
+
+# Single task: status and priority in the same statement
+DETAIL_OPTIONS = (joinedload(Task.status_rel), joinedload(Task.priority_rel))
+
+def task_listing(row) -> dict:
+    # Columns-only row in the TaskResponse shape, master rows from the cache
+    data = dict(row._mapping)
+    status = master_data_cache.get("master_task_status", data["status_id"])
+    priority = master_data_cache.get("master_task_priority", data["priority_id"])
+    data["status_rel"] = status.model_dump() if status else None
+    data["priority_rel"] = priority.model_dump() if priority else None
+    data["status"] = status.name if status else None
+    data["priority"] = priority.name if priority else None
+    return data
 
 class TaskService:
     @staticmethod
@@ -10,23 +28,25 @@ class TaskService:
         db_task = Task(**task.dict())
         db.add(db_task)
         db.commit()
-        db.refresh(db_task)
-        return db_task
+        return TaskService.get_task(db, db_task.id)
 
     @staticmethod
+    @replica_read
     def get_tasks(db: Session, skip: int = 0, limit: int = 100):
-        return db.query(Task).offset(skip).limit(limit).all()
+        rows = db.query(*Task.__table__.columns).offset(skip).limit(limit).all()
+        return [task_listing(row) for row in rows]
 
     @staticmethod
     def get_tasks_by_entity(db: Session, entity_type: str, entity_id: uuid.UUID):
-        return db.query(Task).filter(
+        rows = db.query(*Task.__table__.columns).filter(
             Task.entity_type == entity_type,
             Task.entity_id == entity_id
         ).all()
+        return [task_listing(row) for row in rows]
 
     @staticmethod
     def get_task(db: Session, task_id: uuid.UUID):
-        return db.query(Task).filter(Task.id == task_id).first()
+        return db.query(Task).options(*DETAIL_OPTIONS).filter(Task.id == task_id).first()
 
     @staticmethod
     def update_task(db: Session, task_id: uuid.UUID, task_data: schemas.TaskUpdate) -> Optional[Task]:
@@ -39,8 +59,7 @@ class TaskService:
             setattr(db_task, key, value)
             
         db.commit()
-        db.refresh(db_task)
-        return db_task
+        return TaskService.get_task(db, task_id)
 
     @staticmethod
     def delete_task(db: Session, task_id: uuid.UUID) -> bool:
@@ -51,3 +70,25 @@ class TaskService:
         db.delete(db_task)
         db.commit()
         return True
+
+
+class AsyncTaskService:
+    @staticmethod
+    @replica_read
+    async def get_tasks(db: AsyncSession, skip: int = 0, limit: int = 100):
+        result = await db.execute(select(*Task.__table__.columns).offset(skip).limit(limit))
+        return [task_listing(row) for row in result]
+
+    @staticmethod
+    async def get_tasks_by_entity(db: AsyncSession, entity_type: str, entity_id: uuid.UUID):
+        result = await db.execute(
+            select(*Task.__table__.columns).filter(
+                Task.entity_type == entity_type,
+                Task.entity_id == entity_id
+            )
+        )
+        return [task_listing(row) for row in result]
+
+    @staticmethod
+    async def get_task(db: AsyncSession, task_id: uuid.UUID):
+        return await db.get(Task, task_id, options=DETAIL_OPTIONS)
@@ -0,0 +1,25 @@
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor
+from .schemas import TimelinePage
+from .services import AsyncTimelineService
+
+router = APIRouter()
+
+@router.get("/{entity_type}/{entity_id}", response_model=TimelinePage)
+async def read_timeline(
+    entity_type: str,
+    entity_id: uuid.UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        return await AsyncTimelineService.get_timeline(db, entity_type.upper(), entity_id, cursor=cursor, limit=limit)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
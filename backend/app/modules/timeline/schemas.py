@@ -0,0 +1,21 @@
+from pydantic import BaseModel, UUID4
+from datetime import datetime
+from typing import List, Optional
+
+class TimelineItem(BaseModel):
+    kind: str  # note, task, call, email, attachment, activity
+    id: UUID4
+    occurred_at: datetime
+    title: Optional[str] = None
+    body: Optional[str] = None
+    status: Optional[str] = None
+    actor: Optional[str] = None
+    link: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class TimelinePage(BaseModel):
+    items: List[TimelineItem]
+    next_cursor: Optional[str] = None
+    limit: int
@@ -0,0 +1,101 @@
+import uuid
+
+from sqlalchemy import String, cast, literal_column, null, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.modules.activities.models import Activity, entity_id_matches
+from app.modules.attachments.models import Attachment
+from app.modules.calls.models import Call
+from app.modules.emails.models import EmailLog
+from app.modules.master_data.cache import master_data_cache
+from app.modules.notes.models import Note
+from app.modules.tasks.models import Task
+
+TEXT_COLUMNS = ("title", "body", "status", "actor", "link")
+TIMELINE_COLUMNS = ("kind", "id", "occurred_at") + TEXT_COLUMNS
+
+# kind -> (model, timestamp column, model columns mapped onto TEXT_COLUMNS)
+SOURCES = {
+    "note": (Note, Note.created_at, {"body": Note.content, "actor": Note.created_by}),
+    "task": (Task, Task.created_at, {"title": Task.title, "body": Task.description, "status": Task.status_id}),
+    "call": (Call, Call.created_at, {
+        "title": Call.subject, "body": Call.notes, "status": Call.status, "actor": Call.received_by,
+    }),
+    "email": (EmailLog, EmailLog.sent_at, {
+        "title": EmailLog.subject, "body": EmailLog.body, "status": EmailLog.status, "actor": EmailLog.sent_by,
+    }),
+    "attachment": (Attachment, Attachment.created_at, {
+        "title": Attachment.file_name, "body": Attachment.description,
+        "actor": Attachment.uploaded_by,
+    }),
+    "activity": (Activity, Activity.created_at, {
+        "title": Activity.action_type, "body": Activity.description, "actor": Activity.user_id,
+    }),
+}
+
+
+class TimelineService:
+    @staticmethod
+    def timeline_query(entity_type: str, entity_id: uuid.UUID, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        """
+        UNION ALL over the six entity tables. Each branch filters, orders and
+        limits on its own (entity_type, entity_id, time DESC) index, so the
+        outer sort only merges at most 6 x (limit + 1) rows.
+        """
+        after = decode_cursor(cursor)
+        branches = []
+        for kind, (model, occurred_at, fields) in SOURCES.items():
+            branch = select(
+                literal_column(f"'{kind}'", String).label("kind"),
+                model.id.label("id"),
+                occurred_at.label("occurred_at"),
+                *[cast(fields.get(name, null()), String).label(name) for name in TEXT_COLUMNS],
+            ).where(
+                model.entity_type == entity_type,
+                entity_id_matches(entity_id) if model is Activity else model.entity_id == entity_id,
+                # An undated row can't be placed on the timeline or in a cursor
+                occurred_at.isnot(None),
+            )
+            if after:
+                branch = branch.where(tuple_(occurred_at, model.id) < after)
+            branch = branch.order_by(occurred_at.desc(), model.id.desc()).limit(limit + 1)
+            branches.append(select(branch.subquery()))
+
+        merged = union_all(*branches).subquery()
+        return (
+            select(*[merged.c[name] for name in TIMELINE_COLUMNS])
+            .order_by(merged.c.occurred_at.desc(), merged.c.id.desc())
+            .limit(limit + 1)
+        )
+
+    @staticmethod
+    def to_page(rows, limit: int) -> dict:
+        items = []
+        for row in rows[:limit]:
+            item = dict(row._mapping)
+            if item["kind"] == "task" and item["status"]:
+                item["status"] = master_data_cache.name_for_id("master_task_status", uuid.UUID(item["status"])) or item["status"]
+            elif item["kind"] == "attachment":
+                # The access-checked endpoint, never the stored file path
+                item["link"] = f"/attachments/{item['id']}/download"
+            items.append(item)
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = encode_cursor(last["occurred_at"], last["id"])
+        return {"items": items, "next_cursor": next_cursor, "limit": limit}
+
+
+class AsyncTimelineService:
+    @staticmethod
+    async def get_timeline(
+        db: AsyncSession,
+        entity_type: str,
+        entity_id: uuid.UUID,
+        cursor: str = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ):
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        result = await db.execute(TimelineService.timeline_query(entity_type, entity_id, cursor, limit))
+        return TimelineService.to_page(result.all(), limit)
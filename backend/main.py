@@ -1,7 +1,12 @@
+import logging
+
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.core import config, database
+from sqlalchemy import bindparam, text
+from app.core import config, database, metrics
+from app.core.cache import version_tracker
+from app.core.query_inspector import QueryInspectorMiddleware, query_inspector
 
 # Import routers and models from modules
 from app.modules.leads import router as leads_router
@@ -17,8 +22,51 @@ from app.modules.attachments import router as attachments_router
 from app.modules.emails import router as emails_router
 from app.modules.contacts import router as contacts_router
 from app.modules.settings import router as settings_router
+from app.modules.timeline import router as timeline_router
+from app.modules.search import router as search_router
+from app.modules.master_data.cache import master_data_cache
+from app.modules.settings.cache import settings_cache
+from app.modules.master_data.models import DEFAULT_LEAD_STAGE_GROUPS, LEAD_STAGE_GROUPS
+from app.modules.leads.rollups import LeadRollupService
+from app.modules.activities import models as activity_models
+from app.modules.activities.sink import activity_buffer
+from app.modules.auth.hashing import password_hasher
+
+logger = logging.getLogger(__name__)
+
+# Additive column patches for databases created before the models changed.
+# Anything that rewrites a large table belongs in scripts/migrate_*.py.
+SCHEMA_PATCHES = [
+    "ALTER TABLE attachments ADD COLUMN IF NOT EXISTS description TEXT;",
+    "ALTER TABLE attachments ADD COLUMN IF NOT EXISTS sha256 VARCHAR(64);",
+    "ALTER TABLE attachments ADD COLUMN IF NOT EXISTS file_size BIGINT;",
+    "ALTER TABLE calls ADD COLUMN IF NOT EXISTS duration_seconds INTEGER;",
+    "ALTER TABLE calls ADD COLUMN IF NOT EXISTS call_type TEXT;",
+    "ALTER TABLE calls ADD COLUMN IF NOT EXISTS to_contact TEXT;",
+    "ALTER TABLE calls ADD COLUMN IF NOT EXISTS from_contact TEXT;",
+    "ALTER TABLE calls ADD COLUMN IF NOT EXISTS received_by TEXT;",
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS status_id INTEGER;",
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS priority_id INTEGER;",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0;",
+    "ALTER TABLE master_lead_status ADD COLUMN IF NOT EXISTS stage_group TEXT;",
+    "ALTER TABLE leads ADD COLUMN IF NOT EXISTS qualified_at TIMESTAMPTZ;",
+    "ALTER TABLE leads ADD COLUMN IF NOT EXISTS closed_at TIMESTAMPTZ;",
+]
 
+SEARCH_COLUMNS_PRESENT = (
+    "SELECT count(*) = 3 FROM information_schema.columns "
+    "WHERE table_name IN ('leads', 'contacts', 'organizations') AND column_name = 'search_document';"
+)
 
+UNKNOWN_STAGE_GROUPS = (
+    "SELECT name, stage_group FROM master_lead_status "
+    "WHERE stage_group IS NOT NULL AND stage_group NOT IN :groups;"
+)
+
+ACTIVITY_ENTITY_ID_TYPE = (
+    "SELECT data_type FROM information_schema.columns "
+    "WHERE table_name = 'activities' AND column_name = 'entity_id';"
+)
 
 # Initialize App
 app = FastAPI(title=config.settings.PROJECT_NAME, version=config.settings.PROJECT_VERSION)
@@ -26,24 +74,88 @@ app = FastAPI(title=config.settings.PROJECT_NAME, version=config.settings.PROJEC
 @app.on_event("startup")
 def init_db():
     database.Base.metadata.create_all(bind=database.engine)
+    with database.engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT")
+        # Each patch runs on its own so one failure doesn't skip the rest
+        for statement in SCHEMA_PATCHES:
+            try:
+                conn.execute(text(statement))
+            except Exception as e:
+                logger.warning("Schema patch failed: %s (%s)", statement, e)
+        for name, stage_group in DEFAULT_LEAD_STAGE_GROUPS.items():
+            try:
+                conn.execute(
+                    text("UPDATE master_lead_status SET stage_group = :stage_group WHERE name = :name AND stage_group IS NULL;"),
+                    {"name": name, "stage_group": stage_group},
+                )
+            except Exception as e:
+                logger.warning("Could not backfill stage_group for %s (%s)", name, e)
+        # Stage groups stored before they were validated: fix the casing,
+        # report anything else
+        for stage_group in LEAD_STAGE_GROUPS:
+            try:
+                conn.execute(
+                    text("UPDATE master_lead_status SET stage_group = :stage_group WHERE lower(stage_group) = lower(:stage_group) AND stage_group <> :stage_group;"),
+                    {"stage_group": stage_group},
+                )
+            except Exception as e:
+                logger.warning("Could not normalize stage_group %s (%s)", stage_group, e)
+        try:
+            unknown = conn.execute(
+                text(UNKNOWN_STAGE_GROUPS).bindparams(bindparam("groups", expanding=True)),
+                {"groups": list(LEAD_STAGE_GROUPS)},
+            ).fetchall()
+            for name, stage_group in unknown:
+                logger.warning("Lead status %r has unknown stage_group %r; it is left out of every board", name, stage_group)
+        except Exception as e:
+            logger.warning("Could not check stage groups (%s)", e)
+        if conn.dialect.name == "postgresql" and not conn.execute(text(SEARCH_COLUMNS_PRESENT)).scalar():
+            logger.warning("Search columns are missing; /search fails until scripts/migrate_004_search_index.py has run")
+        if conn.dialect.name == "postgresql":
+            data_type = conn.execute(text(ACTIVITY_ENTITY_ID_TYPE)).scalar()
+            if data_type not in (None, "uuid"):
+                activity_models.LEGACY_TEXT_ENTITY_ID = True
+                logger.warning(
+                    "activities.entity_id is still %s; activity lookups compare it as text until "
+                    "scripts/migrate_003_entity_indexes.py has run (restart the app afterwards)",
+                    data_type,
+                )
+    db = database.SessionLocal()
+    try:
+        buckets = LeadRollupService.ensure_built(db)
+        db.commit()
+        if buckets is not None:
+            logger.info("Built lead pipeline rollups (%d buckets)", buckets)
+    except Exception as e:
+        db.rollback()
+        logger.warning("Could not build lead pipeline rollups; run scripts/rebuild_lead_rollups.py (%s)", e)
+    finally:
+        db.close()
+    version_tracker.refresh()
+    # Each cache on its own, so one failure doesn't leave the other cold; the
+    # refresher thread retries whatever is still missing
     try:
-        app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-    except Exception:
-        pass
+        master_data_cache.load()
+    except Exception as e:
+        logger.warning("Could not load the master data cache (%s)", e)
     try:
-        from sqlalchemy import text
-        with database.engine.connect() as conn:
-            conn.execution_options(isolation_level="AUTOCOMMIT")
-            conn.execute(text("ALTER TABLE attachments ADD COLUMN IF NOT EXISTS description TEXT;"))
-            conn.execute(text("ALTER TABLE calls ADD COLUMN IF NOT EXISTS duration_seconds INTEGER;"))
-            conn.execute(text("ALTER TABLE calls ADD COLUMN IF NOT EXISTS call_type TEXT;"))
-            conn.execute(text("ALTER TABLE calls ADD COLUMN IF NOT EXISTS to_contact TEXT;"))
-            conn.execute(text("ALTER TABLE calls ADD COLUMN IF NOT EXISTS from_contact TEXT;"))
-            conn.execute(text("ALTER TABLE calls ADD COLUMN IF NOT EXISTS received_by TEXT;"))
-            conn.execute(text("ALTER TABLE tasks ADD COLUMN IF NOT EXISTS status_id INTEGER;"))
-            conn.execute(text("ALTER TABLE tasks ADD COLUMN IF NOT EXISTS priority_id INTEGER;"))
-    except Exception:
-        pass
+        settings_cache.load()
+    except Exception as e:
+        logger.warning("Could not load the settings cache (%s)", e)
+    version_tracker.start()
+    if config.settings.ACTIVITY_LOG_MODE == "async":
+        activity_buffer.start()
+
+@app.on_event("shutdown")
+def shutdown():
+    # Flush buffered activities before the worker exits
+    activity_buffer.stop()
+    version_tracker.stop()
+    password_hasher.shutdown()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    await database.async_engine.dispose()
 
 # CORS Metadata
 if config.settings.BACKEND_CORS_ORIGINS:
@@ -55,6 +167,18 @@ if config.settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+if config.settings.QUERY_INSPECTOR_ENABLED:
+    app.add_middleware(QueryInspectorMiddleware, inspector=query_inspector)
+
+# Outermost, so the timing covers every other middleware
+if config.settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware, server_timing=config.settings.SERVER_TIMING_ENABLED)
+    metrics.registry.register_collector("password_hasher", password_hasher.stats)
+
+    @app.get("/metrics", include_in_schema=False)
+    def read_metrics():
+        return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
 
 # Include Routers
 app.include_router(master_data_router.router, prefix="/master-data", tags=["Master Data"])
@@ -70,4 +194,6 @@ app.include_router(attachments_router.router, prefix="/attachments", tags=["Atta
 app.include_router(emails_router.router, prefix="/emails", tags=["Emails"])
 app.include_router(contacts_router.router, prefix="/contacts", tags=["Contacts"])
 app.include_router(settings_router.router, prefix="/settings", tags=["Settings"])
+app.include_router(timeline_router.router, prefix="/timeline", tags=["Timeline"])
+app.include_router(search_router.router, prefix="/search", tags=["Search"])
 
@@ -16,6 +16,7 @@ from app.modules.notes.models import Note
 from app.modules.calls.models import Call
 from app.modules.emails.models import EmailLog
 from app.modules.activities.models import Activity
+from app.core.cache import CacheVersion
 from app.modules.master_data.models import (
     MasterTaskStatus, MasterTaskPriority, MasterLeadStatus,
     MasterIndustry, MasterSource, MasterSalutation, MasterEmployeeCount
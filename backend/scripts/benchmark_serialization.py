@@ -0,0 +1,118 @@
+"""
+Compare the two ways a list endpoint can turn rows into a JSON body.
+
+  default: ORM-style objects validated one by one through LeadResponse
+           (from_attributes), then jsonable_encoder + json.dumps, as FastAPI
+           does for a route that returns ORM objects with a response_model.
+  fast:    plain dicts validated by a single TypeAdapter(List[LeadResponse])
+           and dumped to JSON bytes by pydantic-core (fast_json_response).
+
+Needs no database; rows are synthetic. Usage:
+
+    python scripts/benchmark_serialization.py --rows 200 --repeat 50
+"""
+import argparse
+import json
+import statistics
+import sys
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import List
+
+# Adjust path to find app module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from app.core.serialization import fast_json_response  # noqa: E402
+from app.modules.leads.schemas import LeadResponse  # noqa: E402
+
+LEAD_LIST = TypeAdapter(List[LeadResponse])
+
+
+def make_rows(count: int) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        rows.append({
+            "id": uuid.uuid4(),
+            "branch_id": None,
+            "owner_id": uuid.uuid4(),
+            "salutation": None,
+            "first_name": f"Lead {i}",
+            "last_name": "Example",
+            "job_title": "Buyer",
+            "department": "Procurement",
+            "email": f"lead{i}@example.com",
+            "mobile_no": "+62 812 0000 0000",
+            "gender": None,
+            "organization": "Example Corp",
+            "website": "https://example.com",
+            "industry": uuid.uuid4(),
+            "no_employees": None,
+            "source": uuid.uuid4(),
+            "status": uuid.uuid4(),
+            "estimated_revenue": 125000.0 + i,
+            "probability": 40,
+            "closing_date": now,
+            "created_at": now,
+            "updated_at": now,
+            "deleted_at": None,
+            "status_label": "Qualified",
+            "salutation_label": None,
+            "industry_label": "Manufacturing",
+            "no_employees_label": None,
+            "source_label": "Website",
+        })
+    return rows
+
+
+def default_path(objects) -> bytes:
+    validated = [LeadResponse.model_validate(obj) for obj in objects]
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def fast_path(rows) -> bytes:
+    return fast_json_response(LEAD_LIST, rows).body
+
+
+def measure(fn, payload, repeat: int) -> List[float]:
+    fn(payload)  # warm-up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(payload)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    objects = [SimpleNamespace(**row) for row in rows]
+    if json.loads(default_path(objects)) != json.loads(fast_path(rows)):
+        sys.exit("The two paths produced different JSON")
+
+    results = {
+        "default": measure(default_path, objects, args.repeat),
+        "fast": measure(fast_path, rows, args.repeat),
+    }
+    print(f"{args.rows} rows x {args.repeat} runs")
+    for name, timings in results.items():
+        print(
+            f"{name:>8}: median {statistics.median(timings):7.2f} ms"
+            f"  p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:7.2f} ms"
+        )
+    speedup = statistics.median(results["default"]) / statistics.median(results["fast"])
+    print(f"speed-up: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
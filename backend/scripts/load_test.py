@@ -0,0 +1,350 @@
+"""
+Drive the API with concurrent clients and record a JSON baseline.
+
+Each scenario runs for --duration seconds with --concurrency threads, every
+thread holding one keep-alive connection. Per scenario the baseline records
+p50/p95/p99 latency, throughput, error count and SQL statements per operation
+(read from the Server-Timing header, so SERVER_TIMING_ENABLED must be on).
+
+  lead_list          GET /leads?status=Lead&limit=200
+  deal_board         GET /leads?status=Deal&limit=200
+  lead_detail        the lead page fan-out: lead, activities, notes, tasks,
+                     calls, attachments and emails, fetched one after another
+  status_change      PATCH /leads/{id}/status, cycling through Lead statuses
+  login              POST /auth/login
+  attachment_upload  POST /attachments/upload with --upload-bytes of random data
+
+status_change and attachment_upload write to the database; run them against
+seeded benchmark data (scripts/seed_benchmark_data.py), not a real tenant.
+
+    python scripts/load_test.py --output baseline.json
+    python scripts/load_test.py --output after.json --compare baseline.json
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+SCENARIOS = ("lead_list", "deal_board", "lead_detail", "status_change", "login", "attachment_upload")
+COMPARED = (("p50", "latency_ms"), ("p95", "latency_ms"), ("p99", "latency_ms"), ("throughput_rps", None), ("mean", "queries"))
+
+_QUERY_COUNT = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+class Client:
+    """One keep-alive connection per thread."""
+
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.headers: Dict[str, str] = {}
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = self._local.conn = cls(self.netloc, timeout=self.timeout)
+        return conn
+
+    def request(self, method: str, path: str, body: bytes = None, headers: Dict[str, str] = None) -> Tuple[int, Optional[int], bytes]:
+        """Returns (status, SQL statements reported by the server, body)."""
+        conn = self._connection()
+        try:
+            conn.request(method, self.prefix + path, body=body, headers={**self.headers, **(headers or {})})
+            response = conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self._local.conn = None
+            raise
+        match = _QUERY_COUNT.search(response.getheader("Server-Timing") or "")
+        return response.status, int(match.group(1)) if match else None, data
+
+    def get_json(self, path: str):
+        status, _, data = self.request("GET", path)
+        if status != 200:
+            sys.exit(f"GET {path} returned {status}: {data[:200]!r}")
+        return json.loads(data)
+
+
+class Context:
+    """Fixtures shared by every scenario, fetched once before the run."""
+
+    def __init__(self, client: Client, args):
+        self.client = client
+        self.args = args
+        self.lead_ids: List[str] = []
+        self.lead_statuses: List[str] = []
+        self.upload_payload = os.urandom(args.upload_bytes)
+
+    def prepare(self) -> None:
+        self.client.headers["Authorization"] = f"Bearer {self.login()}"
+        cursor = None
+        for _ in range(self.args.sample_pages):
+            query = {"limit": 200, **({"cursor": cursor} if cursor else {})}
+            page = self.client.get_json(f"/leads?{urlencode(query)}")
+            self.lead_ids += [lead["id"] for lead in page["items"]]
+            cursor = page.get("next_cursor")
+            if not cursor:
+                break
+        self.lead_ids = list(dict.fromkeys(self.lead_ids))
+        if not self.lead_ids:
+            sys.exit("No leads to benchmark against; run scripts/seed_benchmark_data.py first")
+        statuses = self.client.get_json("/master-data/master_lead_status")
+        self.lead_statuses = [s["id"] for s in statuses if s.get("stage_group") == "Lead"] or [s["id"] for s in statuses]
+
+    def login(self) -> str:
+        body = urlencode({"username": self.args.email, "password": self.args.password}).encode()
+        status, _, data = self.client.request(
+            "POST", "/auth/login", body, {"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        if status != 200:
+            sys.exit(f"Login as {self.args.email} failed with {status}: {data[:200]!r}")
+        return json.loads(data)["access_token"]
+
+
+# A scenario performs one operation and returns (succeeded, SQL statements)
+
+def _single(client: Client, method: str, path: str, body: bytes = None, headers: Dict[str, str] = None):
+    status, queries, _ = client.request(method, path, body, headers)
+    return status < 400, queries
+
+
+def lead_list(ctx: Context, rng: random.Random):
+    return _single(ctx.client, "GET", "/leads?status=Lead&limit=200")
+
+
+def deal_board(ctx: Context, rng: random.Random):
+    return _single(ctx.client, "GET", "/leads?status=Deal&limit=200")
+
+
+def lead_detail(ctx: Context, rng: random.Random):
+    lead_id = rng.choice(ctx.lead_ids)
+    related = urlencode({"entity_type": "LEAD", "entity_id": lead_id})
+    paths = (
+        f"/leads/{lead_id}",
+        f"/activities/LEAD/{lead_id}",
+        f"/notes/?{related}",
+        f"/tasks/?{related}",
+        f"/calls/?{related}",
+        f"/attachments/LEAD/{lead_id}",
+        f"/emails/LEAD/{lead_id}",
+    )
+    ok, total = True, 0
+    for path in paths:
+        status, queries, _ = ctx.client.request("GET", path)
+        ok = ok and status < 400
+        total = None if total is None or queries is None else total + queries
+    return ok, total
+
+
+def status_change(ctx: Context, rng: random.Random):
+    body = json.dumps({"status": rng.choice(ctx.lead_statuses)}).encode()
+    return _single(
+        ctx.client, "PATCH", f"/leads/{rng.choice(ctx.lead_ids)}/status", body, {"Content-Type": "application/json"}
+    )
+
+
+def login(ctx: Context, rng: random.Random):
+    body = urlencode({"username": ctx.args.email, "password": ctx.args.password}).encode()
+    return _single(ctx.client, "POST", "/auth/login", body, {"Content-Type": "application/x-www-form-urlencoded"})
+
+
+def attachment_upload(ctx: Context, rng: random.Random):
+    boundary = uuid.uuid4().hex
+    fields = {"entity_type": "LEAD", "entity_id": rng.choice(ctx.lead_ids), "is_public": "true"}
+    parts = [
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in fields.items()
+    ]
+    # A fresh prefix per upload keeps content-addressed storage from
+    # collapsing every request into a reference-count bump
+    payload = uuid.uuid4().bytes + ctx.upload_payload
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="bench.bin"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n".encode() + payload + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return _single(
+        ctx.client, "POST", "/attachments/upload", b"".join(parts),
+        {"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+
+
+SCENARIO_FUNCTIONS: Dict[str, Callable[[Context, random.Random], Tuple[bool, Optional[int]]]] = {
+    "lead_list": lead_list,
+    "deal_board": deal_board,
+    "lead_detail": lead_detail,
+    "status_change": status_change,
+    "login": login,
+    "attachment_upload": attachment_upload,
+}
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    # Nearest-rank on an already sorted list
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_scenario(ctx: Context, name: str) -> dict:
+    scenario = SCENARIO_FUNCTIONS[name]
+    args = ctx.args
+    warmup_until = time.monotonic() + args.warmup
+    stop_at = warmup_until + args.duration
+    lock = threading.Lock()
+    latencies: List[float] = []
+    queries: List[int] = []
+    errors = 0
+
+    def worker(seed: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed)
+        while True:
+            started = time.monotonic()
+            if started >= stop_at:
+                return
+            try:
+                ok, count = scenario(ctx, rng)
+            except (OSError, http.client.HTTPException):
+                ok, count = False, None
+            finished = time.monotonic()
+            if started < warmup_until:
+                continue
+            with lock:
+                latencies.append((finished - started) * 1000)
+                if not ok:
+                    errors += 1
+                if count is not None:
+                    queries.append(count)
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for future in [pool.submit(worker, args.seed + i) for i in range(args.concurrency)]:
+            future.result()
+
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / args.duration, 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "mean": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+        "queries": {
+            "mean": round(statistics.fmean(queries), 2) if queries else None,
+            "max": max(queries) if queries else None,
+        },
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metric(result: dict, key: str, group: Optional[str]):
+    return result.get(group, {}).get(key) if group else result.get(key)
+
+
+def compare(baseline: dict, current: dict) -> None:
+    print(f"\nCompared with {baseline['meta'].get('commit') or 'baseline'} ({baseline['meta'].get('timestamp')})")
+    for name, result in current["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            continue
+        cells = []
+        for key, group in COMPARED:
+            before, after = _metric(old, key, group), _metric(result, key, group)
+            label = "queries" if group == "queries" else key
+            if before in (None, 0) or after is None:
+                cells.append(f"{label} {after}")
+            else:
+                cells.append(f"{label} {before}->{after} ({(after - before) / before * 100:+.0f}%)")
+        print(f"  {name:<18} " + "  ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test with a JSON baseline")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before each scenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--email", default="bench@bench.invalid")
+    parser.add_argument("--password", default="benchmark")
+    parser.add_argument("--sample-pages", type=int, default=5, help="pages of 200 leads to pick ids from")
+    parser.add_argument("--upload-bytes", type=int, default=256 * 1024)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="load_test.json")
+    parser.add_argument("--compare", help="earlier baseline to diff against")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIO_FUNCTIONS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+
+    ctx = Context(Client(args.base_url, args.timeout), args)
+    ctx.prepare()
+    print(f"{len(ctx.lead_ids)} sample leads, {args.concurrency} clients, {args.duration:g}s per scenario")
+
+    results = {}
+    for name in names:
+        result = results[name] = run_scenario(ctx, name)
+        latency = result["latency_ms"]
+        print(
+            f"  {name:<18} {result['throughput_rps']:8.1f} rps  p50 {latency['p50']:8.1f}  p95 {latency['p95']:8.1f}"
+            f"  p99 {latency['p99']:8.1f} ms  queries {result['queries']['mean']}  errors {result['errors']}"
+        )
+
+    report = {
+        "meta": {
+            "base_url": args.base_url,
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "sample_leads": len(ctx.lead_ids),
+        },
+        "scenarios": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import sys
+import os
+
+# Adjust path to find app module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.modules.master_data.models import DEFAULT_LEAD_STAGE_GROUPS  # noqa: E402
+
+INDEXES = [
+    # Keyset pagination for GET /leads
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_leads_created_at_id ON leads (created_at, id);",
+    # Lead / Opportunity / Deal bucket listings
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_leads_status_created_at ON leads (status, created_at);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_master_lead_status_stage_group ON master_lead_status (stage_group);",
+]
+
+def migrate():
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.connect() as conn:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        conn.execution_options(isolation_level="AUTOCOMMIT")
+
+        print("Starting lead pipeline migration...")
+
+        conn.execute(text("ALTER TABLE master_lead_status ADD COLUMN IF NOT EXISTS stage_group TEXT;"))
+        for name, stage_group in DEFAULT_LEAD_STAGE_GROUPS.items():
+            conn.execute(
+                text("UPDATE master_lead_status SET stage_group = :stage_group WHERE name = :name AND stage_group IS NULL;"),
+                {"name": name, "stage_group": stage_group},
+            )
+        print("Backfilled master_lead_status.stage_group.")
+
+        for statement in INDEXES:
+            try:
+                conn.execute(text(statement))
+                print(f"OK: {statement}")
+            except Exception as e:
+                print(f"Error running '{statement}': {e}")
+
+        # Tell running workers to reload their master data cache
+        try:
+            conn.execute(text(
+                "INSERT INTO cache_versions (name, version) VALUES ('master_lead_status', 1) "
+                "ON CONFLICT (name) DO UPDATE SET version = cache_versions.version + 1;"
+            ))
+        except Exception as e:
+            print(f"Could not bump cache version: {e}")
+
+    print("Migration completed.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,70 @@
+import sys
+import os
+
+# Adjust path to find app module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+UUID_PATTERN = "^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}$"
+
+INDEXES = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notes_entity_created_at ON notes (entity_type, entity_id, created_at DESC);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_entity_created_at ON tasks (entity_type, entity_id, created_at DESC);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_calls_entity_created_at ON calls (entity_type, entity_id, created_at DESC);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_email_logs_entity_sent_at ON email_logs (entity_type, entity_id, sent_at DESC);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_attachments_entity_created_at ON attachments (entity_type, entity_id, created_at DESC);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_activities_entity_created_at ON activities (entity_type, entity_id, created_at DESC);",
+]
+
+def convert_activity_entity_id(conn):
+    data_type = conn.execute(text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_name = 'activities' AND column_name = 'entity_id';"
+    )).scalar()
+    if data_type == "uuid":
+        print("activities.entity_id is already uuid.")
+        return True
+
+    invalid = conn.execute(
+        text("SELECT id, entity_id FROM activities WHERE entity_id !~ :pattern LIMIT 20;"),
+        {"pattern": UUID_PATTERN},
+    ).fetchall()
+    if invalid:
+        print("activities.entity_id has values that are not UUIDs; fix or delete them first:")
+        for row in invalid:
+            print(f"  {row.id}: {row.entity_id!r}")
+        return False
+
+    # Rewrites the table under an exclusive lock; run in a quiet window
+    conn.execute(text("ALTER TABLE activities ALTER COLUMN entity_id TYPE uuid USING entity_id::uuid;"))
+    print("Converted activities.entity_id to uuid.")
+    return True
+
+def migrate():
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.connect() as conn:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        conn.execution_options(isolation_level="AUTOCOMMIT")
+
+        print("Starting entity index migration...")
+
+        if not convert_activity_entity_id(conn):
+            print("Skipping the activities index until entity_id is converted.")
+            statements = [s for s in INDEXES if " ON activities " not in s]
+        else:
+            statements = INDEXES
+
+        for statement in statements:
+            try:
+                conn.execute(text(statement))
+                print(f"OK: {statement}")
+            except Exception as e:
+                # A failed concurrent build leaves an INVALID index behind; drop it and rerun
+                print(f"Error running '{statement}': {e}")
+
+    print("Migration completed.")
+
+if __name__ == "__main__":
+    migrate()
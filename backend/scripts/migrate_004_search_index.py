@@ -0,0 +1,30 @@
+import sys
+import os
+
+# Adjust path to find app module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.modules.search.ddl import SEARCH_COLUMNS_DDL, SEARCH_INDEXES  # noqa: E402
+
+def migrate():
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.connect() as conn:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        conn.execution_options(isolation_level="AUTOCOMMIT")
+
+        print("Starting search index migration...")
+
+        # Adding a stored generated column rewrites the table once
+        for statement in SEARCH_COLUMNS_DDL + SEARCH_INDEXES:
+            try:
+                conn.execute(text(statement))
+                print(f"OK: {statement}")
+            except Exception as e:
+                print(f"Error running '{statement}': {e}")
+
+    print("Migration completed.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,33 @@
+"""
+Recompute lead_pipeline_rollups from the leads table.
+
+The API rebuilds them once on its first start after deploy; run this whenever
+the counters are suspected to have drifted. Lead writes wait for the rebuild
+to commit, so it can run while the API is up.
+"""
+import sys
+import os
+
+# Adjust path to find app module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.modules.leads.models import LeadPipelineRollup  # noqa: E402
+from app.modules.leads.rollups import LeadRollupService  # noqa: E402
+
+def rebuild():
+    LeadPipelineRollup.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        print("Rebuilding lead pipeline rollups...")
+        buckets = LeadRollupService.rebuild(db)
+        db.commit()
+        print(f"Rebuilt {buckets} buckets.")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild()
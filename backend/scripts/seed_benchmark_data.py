@@ -0,0 +1,217 @@
+"""
+Seed a benchmark dataset: N leads, each with linked notes, calls, tasks and
+activities, plus a login user for the load test (scripts/load_test.py).
+
+Postgres only. Rows are generated server-side with generate_series, one
+statement per batch, so a million leads takes minutes rather than hours.
+Benchmark leads use @bench.invalid e-mail addresses; --reset removes them and
+everything linked to them before seeding.
+
+    python scripts/seed_benchmark_data.py --leads 10k
+    python scripts/seed_benchmark_data.py --leads 1m --per-lead 3 --reset
+"""
+import argparse
+import sys
+import os
+import time
+
+# Adjust path to find app module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+from app.core.cache import bump_version  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.modules.auth.models import User  # noqa: E402
+from app.modules.auth.utils import get_password_hash  # noqa: E402
+from app.modules.leads.rollups import LeadRollupService  # noqa: E402
+from app.modules.master_data.models import (  # noqa: E402
+    CLOSED_LEAD_STATUSES, DEFAULT_LEAD_STAGE_GROUPS, MASTER_TABLES, MasterLeadStatus,
+)
+
+BENCH_DOMAIN = "bench.invalid"
+BENCH_USER = f"bench@{BENCH_DOMAIN}"
+BATCH_SIZE = 50_000
+
+MASTER_NAMES = {
+    "master_sources": ["Website", "Referral", "Cold Call", "Exhibition", "LinkedIn"],
+    "master_industries": ["Technology", "Finance", "Healthcare", "Manufacturing", "Retail"],
+    "master_task_status": ["Backlog", "Todo", "In Progress", "Done"],
+    "master_task_priority": ["Low", "Medium", "High"],
+}
+
+SEED_BATCH = """
+WITH new_leads AS (
+    INSERT INTO leads (
+        id, first_name, last_name, email, organization, source, industry, status,
+        estimated_revenue, probability, closing_date, created_at, updated_at,
+        qualified_at, closed_at
+    )
+    SELECT
+        gen_random_uuid(),
+        'Bench',
+        'Lead ' || i,
+        'lead' || i || '@bench.invalid',
+        'Bench Org ' || (i % 5000),
+        (CAST(:sources AS uuid[]))[1 + i % cardinality(CAST(:sources AS uuid[]))],
+        (CAST(:industries AS uuid[]))[1 + i % cardinality(CAST(:industries AS uuid[]))],
+        s.status,
+        1000 + (i % 997) * 250,
+        (i % 10) * 10,
+        now() + ((i % 120) || ' days')::interval,
+        s.created_at,
+        s.created_at,
+        CASE WHEN s.status = ANY(CAST(:lead_stage AS uuid[])) THEN NULL
+             ELSE s.created_at + ((1 + i % 30) || ' days')::interval END,
+        CASE WHEN s.status = ANY(CAST(:closed AS uuid[]))
+             THEN s.created_at + ((31 + i % 60) || ' days')::interval END
+    FROM generate_series(CAST(:first AS bigint), CAST(:last AS bigint)) AS i
+    CROSS JOIN LATERAL (
+        SELECT
+            (CAST(:statuses AS uuid[]))[1 + i % cardinality(CAST(:statuses AS uuid[]))] AS status,
+            now() - ((i % 525600) || ' minutes')::interval AS created_at
+    ) AS s
+    RETURNING id, created_at
+),
+new_notes AS (
+    INSERT INTO notes (id, content, entity_type, entity_id, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Benchmark note ' || n, 'LEAD', l.id,
+           l.created_at + n * interval '1 hour', l.created_at + n * interval '1 hour'
+    FROM new_leads l CROSS JOIN generate_series(1, CAST(:per_lead AS int)) AS n
+),
+new_calls AS (
+    INSERT INTO calls (id, subject, status, call_type, duration_seconds, entity_type, entity_id, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Benchmark call ' || n, 'Completed', 'Outgoing', 60 * n, 'LEAD', l.id,
+           l.created_at + n * interval '2 hours', l.created_at + n * interval '2 hours'
+    FROM new_leads l CROSS JOIN generate_series(1, CAST(:per_lead AS int)) AS n
+),
+new_tasks AS (
+    INSERT INTO tasks (id, title, status_id, priority_id, due_date, entity_type, entity_id, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Benchmark task ' || n,
+           (CAST(:task_statuses AS uuid[]))[1 + n % cardinality(CAST(:task_statuses AS uuid[]))],
+           (CAST(:task_priorities AS uuid[]))[1 + n % cardinality(CAST(:task_priorities AS uuid[]))],
+           l.created_at + n * interval '1 day', 'LEAD', l.id,
+           l.created_at + n * interval '3 hours', l.created_at + n * interval '3 hours'
+    FROM new_leads l CROSS JOIN generate_series(1, CAST(:per_lead AS int)) AS n
+),
+new_activities AS (
+    INSERT INTO activities (id, action_type, entity_type, entity_id, description, created_at)
+    SELECT gen_random_uuid(), CASE WHEN n = 1 THEN 'CREATE' ELSE 'UPDATE' END, 'LEAD', l.id,
+           'Benchmark activity ' || n, l.created_at + n * interval '4 hours'
+    FROM new_leads l CROSS JOIN generate_series(1, CAST(:per_lead AS int)) AS n
+)
+SELECT count(*) FROM new_leads
+"""
+
+RESET_STATEMENTS = [
+    f"DELETE FROM {table} WHERE entity_type = 'LEAD' AND entity_id IN "
+    "(SELECT id FROM leads WHERE email LIKE '%@bench.invalid')"
+    for table in ("notes", "calls", "tasks", "activities")
+] + ["DELETE FROM leads WHERE email LIKE '%@bench.invalid'"]
+
+
+def parse_size(value: str) -> int:
+    # 10k / 100k / 1m / 2500
+    value = value.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    number = value[:-1] if multiplier != 1 else value
+    try:
+        return int(float(number) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size: {value}")
+
+
+def ensure_master_data(db):
+    for name, stage_group in DEFAULT_LEAD_STAGE_GROUPS.items():
+        if not db.query(MasterLeadStatus).filter_by(name=name).first():
+            db.add(MasterLeadStatus(name=name, stage_group=stage_group))
+            bump_version(db, "master_lead_status")
+    for table, names in MASTER_NAMES.items():
+        model = MASTER_TABLES[table]
+        for name in names:
+            if not db.query(model).filter_by(name=name).first():
+                db.add(model(name=name))
+                bump_version(db, table)
+    db.commit()
+
+    ids = {}
+    for table in ["master_lead_status", *MASTER_NAMES]:
+        model = MASTER_TABLES[table]
+        ids[table] = [str(row.id) for row in db.query(model.id).order_by(model.name)]
+    statuses = db.query(MasterLeadStatus).all()
+    ids["lead_stage"] = [str(s.id) for s in statuses if s.stage_group == "Lead"]
+    ids["closed"] = [str(s.id) for s in statuses if s.name in CLOSED_LEAD_STATUSES]
+    return ids
+
+
+def ensure_bench_user(db, password: str):
+    user = db.query(User).filter(User.email == BENCH_USER).first()
+    if not user:
+        db.add(User(email=BENCH_USER, hashed_password=get_password_hash(password), full_name="Benchmark", is_active=True))
+    else:
+        user.hashed_password = get_password_hash(password)
+    db.commit()
+
+
+def seed(leads: int, per_lead: int, reset: bool, password: str):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if reset:
+            print("Removing previous benchmark data...")
+            for statement in RESET_STATEMENTS:
+                db.execute(text(statement))
+            db.commit()
+
+        ids = ensure_master_data(db)
+        ensure_bench_user(db, password)
+
+        offset = db.execute(text("SELECT count(*) FROM leads WHERE email LIKE '%@bench.invalid'")).scalar()
+        print(f"Seeding {leads} leads with {per_lead} notes/calls/tasks/activities each...")
+        started = time.monotonic()
+        for first in range(offset + 1, offset + leads + 1, BATCH_SIZE):
+            last = min(first + BATCH_SIZE - 1, offset + leads)
+            db.execute(text(SEED_BATCH), {
+                "first": first,
+                "last": last,
+                "per_lead": per_lead,
+                "sources": ids["master_sources"],
+                "industries": ids["master_industries"],
+                "statuses": ids["master_lead_status"],
+                "task_statuses": ids["master_task_status"],
+                "task_priorities": ids["master_task_priority"],
+                "lead_stage": ids["lead_stage"],
+                "closed": ids["closed"],
+            })
+            db.commit()
+            print(f"  {last - offset}/{leads} leads ({time.monotonic() - started:.0f}s)")
+
+        print("Rebuilding lead pipeline rollups...")
+        LeadRollupService.rebuild(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in ("leads", "notes", "calls", "tasks", "activities", "lead_pipeline_rollups"):
+            conn.execute(text(f"ANALYZE {table}"))
+    print(f"Done in {time.monotonic() - started:.0f}s. Load test login: {BENCH_USER}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a benchmark dataset")
+    parser.add_argument("--leads", type=parse_size, default=parse_size("10k"), help="10k, 100k, 1m, ...")
+    parser.add_argument("--per-lead", type=int, default=2, help="notes, calls, tasks and activities per lead")
+    parser.add_argument("--reset", action="store_true", help="remove earlier benchmark data first")
+    parser.add_argument("--password", default="benchmark", help=f"password for {BENCH_USER}")
+    args = parser.parse_args()
+    if engine.dialect.name != "postgresql":
+        sys.exit("The benchmark seeder needs Postgres")
+    seed(args.leads, args.per_lead, args.reset, args.password)
+
+
+if __name__ == "__main__":
+    main()
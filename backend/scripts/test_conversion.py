@@ -75,7 +75,7 @@ def test_conversion():
              print("Organization Linkage MISSING in Deal/Contact")
 
         # 6. Verify Filtering
-        leads = LeadService.get_leads(db)
+        leads = LeadService.get_leads(db)["items"]
         found = any(itm.id == lead.id for itm in leads)
         if found:
             print("Lead STILL visible in get_leads list (Expected: HIDDEN)")
@@ -37,15 +37,15 @@ def seed_master_data():
 
         # Lead Statuses
         lead_statuses = [
-            {"name": "New", "color": "#3b82f6"},
-            {"name": "Attempted to Contact", "color": "#f59e0b"},
-            {"name": "Contacted", "color": "#10b981"},
-            {"name": "Qualified", "color": "#8b5cf6"},
-            {"name": "Unqualified", "color": "#6b7280"},
-            {"name": "Proposal", "color": "#6366f1"}, 
-            {"name": "Negotiation", "color": "#8b5cf6"},
-            {"name": "Closed Won", "color": "#10b981"},
-            {"name": "Closed Lost", "color": "#ef4444"}
+            {"name": "New", "color": "#3b82f6", "stage_group": "Lead"},
+            {"name": "Attempted to Contact", "color": "#f59e0b", "stage_group": "Lead"},
+            {"name": "Contacted", "color": "#10b981", "stage_group": "Lead"},
+            {"name": "Qualified", "color": "#8b5cf6", "stage_group": "Opportunity"},
+            {"name": "Unqualified", "color": "#6b7280", "stage_group": "Lead"},
+            {"name": "Proposal", "color": "#6366f1", "stage_group": "Deal"}, 
+            {"name": "Negotiation", "color": "#8b5cf6", "stage_group": "Deal"},
+            {"name": "Closed Won", "color": "#10b981", "stage_group": "Deal"},
+            {"name": "Closed Lost", "color": "#ef4444", "stage_group": "Deal"}
         ]
         for s in lead_statuses:
             exists = db.query(MasterLeadStatus).filter(MasterLeadStatus.name == s["name"]).first()
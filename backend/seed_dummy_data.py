@@ -23,7 +23,7 @@ from app.modules.emails.models import EmailLog
 from app.modules.activities.models import Activity
 from app.modules.master_data.models import (
     MasterIndustry, MasterSource, MasterSalutation, 
-    MasterEmployeeCount, MasterLeadStatus
+    MasterEmployeeCount, MasterLeadStatus, DEFAULT_LEAD_STAGE_GROUPS
 )
 
 fake = Faker()
@@ -71,7 +71,7 @@ def seed_master_data():
     ]
     for name, color in statuses:
         if not db.query(MasterLeadStatus).filter(MasterLeadStatus.name == name).first():
-            db.add(MasterLeadStatus(name=name, color=color))
+            db.add(MasterLeadStatus(name=name, color=color, stage_group=DEFAULT_LEAD_STAGE_GROUPS.get(name)))
             
     db.commit()
 
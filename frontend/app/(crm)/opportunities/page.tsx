@@ -1,23 +1,12 @@
-import { apiFetch } from '@/lib/api'
 import LeadsClient from '../../dashboard/leads/client'
+import { fetchLeadPage } from '../../dashboard/leads/actions'
 import { searchMasterData } from '../../dashboard/leads/master-actions'
 
-async function getOpportunities() {
-    try {
-        const res = await apiFetch('/leads?status=Opportunity')
-        if (!res.ok) return []
-        return await res.json()
-    } catch (error) {
-        console.error('Failed to fetch opportunities:', error)
-        return []
-    }
-}
-
 export default async function OpportunitiesPage() {
-    const leadsData = getOpportunities()
+    const leadsData = fetchLeadPage('Opportunity')
     const statusesData = searchMasterData('master_lead_status', '')
 
-    const [leads, statuses] = await Promise.all([leadsData, statusesData])
+    const [page, statuses] = await Promise.all([leadsData, statusesData])
 
     const statusOptions = (statuses || []).map((s: any) => ({
         label: s.name,
@@ -31,7 +20,9 @@ export default async function OpportunitiesPage() {
                 <p className="text-muted-foreground">Manage and track your high-value sales opportunities.</p>
             </div>
             <LeadsClient
-                leads={leads}
+                leads={page.items}
+                nextCursor={page.next_cursor}
+                stage="Opportunity"
                 statusOptions={statusOptions}
                 summaryTitle="Total Opportunity"
                 title="Opportunities"
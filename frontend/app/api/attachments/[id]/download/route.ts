@@ -0,0 +1,38 @@
+import { NextRequest } from 'next/server'
+import { cookies } from 'next/headers'
+
+const BACKEND_URL = process.env.BACKEND_URL || process.env.NEXT_PUBLIC_API_URL || 'http://127.0.0.1:8000'
+
+// Forwarded both ways so range requests and 304s work through the proxy
+const REQUEST_HEADERS = ['range', 'if-range', 'if-none-match', 'if-modified-since']
+const RESPONSE_HEADERS = [
+    'content-type', 'content-length', 'content-disposition', 'content-range',
+    'accept-ranges', 'etag', 'last-modified', 'cache-control',
+    'x-content-type-options', 'content-security-policy',
+]
+
+export async function GET(request: NextRequest, { params }: { params: Promise<{ id: string }> }) {
+    const { id } = await params
+    const cookieStore = await cookies()
+    const token = cookieStore.get('access_token')?.value
+
+    const headers: Record<string, string> = {}
+    for (const name of REQUEST_HEADERS) {
+        const value = request.headers.get(name)
+        if (value) headers[name] = value
+    }
+    if (token) headers['Authorization'] = `Bearer ${token}`
+
+    const inline = request.nextUrl.searchParams.get('inline') === 'true'
+    const response = await fetch(
+        `${BACKEND_URL}/attachments/${encodeURIComponent(id)}/download${inline ? '?inline=true' : ''}`,
+        { headers, cache: 'no-store' }
+    )
+
+    const out = new Headers()
+    for (const name of RESPONSE_HEADERS) {
+        const value = response.headers.get(name)
+        if (value) out.set(name, value)
+    }
+    return new Response(response.body, { status: response.status, headers: out })
+}
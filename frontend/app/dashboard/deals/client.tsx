@@ -1,14 +1,17 @@
 'use client'
 
-import { useState } from 'react'
+import { useEffect, useState, useTransition } from 'react'
 import { Plus } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { CreateDealDialog } from '@/components/deals/create-deal-dialog'
 import { DataTable } from '@/components/ui/data-table'
 import { getColumns } from '@/components/deals/columns'
+import { fetchLeadPage } from '../leads/actions'
 
 interface DealsClientProps {
     deals: any[]
+    // Cursor for the next page of the board; null once everything is loaded
+    nextCursor?: string | null
     baseUrl?: string
     statusOptions?: {
         label: string
@@ -16,10 +19,27 @@ interface DealsClientProps {
     }[]
 }
 
-export default function DealsClient({ deals, baseUrl = "/deals", statusOptions = [] }: DealsClientProps) {
+export default function DealsClient({ deals, nextCursor = null, baseUrl = "/deals", statusOptions = [] }: DealsClientProps) {
     const [isCreateOpen, setIsCreateOpen] = useState(false)
+    const [rows, setRows] = useState(deals)
+    const [cursor, setCursor] = useState(nextCursor)
+    const [isLoading, startLoading] = useTransition()
     const columns = getColumns(baseUrl)
 
+    // Start over whenever the server sends a fresh first page
+    useEffect(() => {
+        setRows(deals)
+        setCursor(nextCursor)
+    }, [deals, nextCursor])
+
+    const loadMore = () => {
+        startLoading(async () => {
+            const page = await fetchLeadPage('Deal', cursor)
+            setRows((current) => [...current, ...page.items])
+            setCursor(page.next_cursor)
+        })
+    }
+
     return (
         <div className="flex flex-col h-full space-y-6">
             <div className="flex items-center justify-between">
@@ -37,10 +57,20 @@ export default function DealsClient({ deals, baseUrl = "/deals", statusOptions =
             <div className="flex-1">
                 <DataTable
                     columns={columns}
-                    data={deals}
+                    data={rows}
                     filterColumn="name"
                     filterPlaceholder="Filter by name..."
                 />
+                {cursor && (
+                    <div className="flex flex-col items-center gap-2 pt-4">
+                        <p className="text-sm text-muted-foreground">
+                            Showing {rows.length} loaded so far; filters cover loaded rows only.
+                        </p>
+                        <Button variant="outline" size="sm" onClick={loadMore} disabled={isLoading}>
+                            {isLoading ? 'Loading...' : 'Load more'}
+                        </Button>
+                    </div>
+                )}
             </div>
 
             <CreateDealDialog open={isCreateOpen} onOpenChange={setIsCreateOpen} />
@@ -171,3 +171,23 @@ export async function convertLead(leadId: string, payload: any) {
 }
 
 
+
+export async function fetchLeadPage(status: 'Lead' | 'Opportunity' | 'Deal', cursor?: string | null) {
+    try {
+        const { apiFetch } = await import('@/lib/api')
+        const params = new URLSearchParams({ status, limit: '200' })
+        if (cursor) params.set('cursor', cursor)
+        const res = await apiFetch(`/leads?${params}`, { cache: 'no-store' })
+
+        if (!res.ok) {
+            console.error('Error fetching leads:', await res.text())
+            return { items: [], next_cursor: null }
+        }
+
+        const page = await res.json()
+        return { items: page.items ?? [], next_cursor: page.next_cursor ?? null }
+    } catch (error) {
+        console.error('Error fetching leads:', error)
+        return { items: [], next_cursor: null }
+    }
+}
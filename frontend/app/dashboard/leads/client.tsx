@@ -1,6 +1,6 @@
 'use client'
 
-import { useState } from 'react'
+import { useEffect, useState, useTransition } from 'react'
 import { Plus } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { CreateLeadDialog } from '@/components/leads/create-lead-dialog'
@@ -8,9 +8,13 @@ import { LeadSummaryCards } from '@/components/leads/lead-summary-cards'
 import { DataTable } from '@/components/ui/data-table'
 
 import { getColumns } from '@/components/leads/columns'
+import { fetchLeadPage } from './actions'
 
 interface LeadsClientProps {
     leads: any[]
+    // Cursor for the next page of the board; null once everything is loaded
+    nextCursor?: string | null
+    stage?: 'Lead' | 'Opportunity'
     baseUrl?: string
     statusOptions?: {
         label: string
@@ -24,6 +28,8 @@ interface LeadsClientProps {
 
 export default function LeadsClient({
     leads,
+    nextCursor = null,
+    stage = "Lead",
     baseUrl = "/leads",
     statusOptions = [],
     summaryTitle,
@@ -32,8 +38,25 @@ export default function LeadsClient({
     dialogTitle = "Lead"
 }: LeadsClientProps) {
     const [isCreateOpen, setIsCreateOpen] = useState(false)
+    const [rows, setRows] = useState(leads)
+    const [cursor, setCursor] = useState(nextCursor)
+    const [isLoading, startLoading] = useTransition()
     const columns = getColumns(baseUrl)
 
+    // Start over whenever the server sends a fresh first page
+    useEffect(() => {
+        setRows(leads)
+        setCursor(nextCursor)
+    }, [leads, nextCursor])
+
+    const loadMore = () => {
+        startLoading(async () => {
+            const page = await fetchLeadPage(stage, cursor)
+            setRows((current) => [...current, ...page.items])
+            setCursor(page.next_cursor)
+        })
+    }
+
     const filterableColumns = [
         {
             id: "status_label",
@@ -56,16 +79,26 @@ export default function LeadsClient({
                 </div>
             </div>
 
-            <LeadSummaryCards leads={leads} title={summaryTitle} newLabel={newLabel} />
+            <LeadSummaryCards leads={rows} title={summaryTitle} newLabel={newLabel} />
 
             <div className="flex-1">
                 <DataTable
                     columns={columns}
-                    data={leads}
+                    data={rows}
                     filterableColumns={filterableColumns}
                     filterColumn="name"
                     filterPlaceholder="Filter by name..."
                 />
+                {cursor && (
+                    <div className="flex flex-col items-center gap-2 pt-4">
+                        <p className="text-sm text-muted-foreground">
+                            Showing {rows.length} loaded so far; summary and filters cover loaded rows only.
+                        </p>
+                        <Button variant="outline" size="sm" onClick={loadMore} disabled={isLoading}>
+                            {isLoading ? 'Loading...' : 'Load more'}
+                        </Button>
+                    </div>
+                )}
             </div>
 
             <CreateLeadDialog open={isCreateOpen} onOpenChange={setIsCreateOpen} title={dialogTitle} />
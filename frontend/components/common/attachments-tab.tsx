@@ -82,8 +82,8 @@ export function AttachmentsTab({ entityType, entityId }: AttachmentsTabProps) {
                     ) : (
                         <div className="space-y-2">
                             {attachments.map((file) => {
-                                const base = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-                                const previewSrc = `${base}/${(file.file_path || '').replace(/\\\\/g, '/')}`
+                                // Served through the access-checked download endpoint
+                                const previewSrc = `/api/attachments/${file.id}/download?inline=true`
                                 const isImage = (file.file_type || '').startsWith('image/')
                                 return (
                                     <div key={file.id} className="flex items-center justify-between p-3 border rounded-md hover:bg-gray-50">
@@ -123,7 +123,7 @@ export function CreateTaskDialog({ open, onOpenChange, defaultEntity }: CreateTa
     useEffect(() => {
         if (searchQuery.length > 1) {
             apiFetchClient(`/leads?query=${searchQuery}`).then(r => r.json()).then(data => {
-                setEntities(data.map((l: any) => ({
+                setEntities((data.items ?? []).map((l: any) => ({
                     id: l.id,
                     name: `${l.first_name} ${l.last_name || ''}`,
                     type: 'LEAD'